@@ -0,0 +1,383 @@
+#   benchmarks of the mapper
+#
+#   python benchmark.py --rows 1000000
+#   python benchmark.py --rows 1000000 --refs 6 --unknown 0.1 --memory --json bench.json
+#
+#   the synthetic inventory is written to a temporary CSV, each stage of
+#   the mapping (read_csv, cleanBefore, mapping, cleanAfter, save) is timed,
+#   the results can be written as JSON to track them across versions,
+#   the cold start of the command line is checked against its budget
+#
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import mapper as mf
+
+
+# synthetic inventory, a list of rows [id, references] as read by Map.read_csv
+#   rows = number of rows
+#   refs = maximal number of references per row
+#   enhancements = share of references with an enhancement, e.g. SC-5(3)
+#   repetition = share of rows repeating the cell of one of the previous rows
+#   withdrawn = share of references to withdrawn controls
+#   unknown = share of references to unknown controls
+def syntheticRows(rows, refs = 4, enhancements = 0.3, repetition = 0.0,
+                  withdrawn = 0.0, unknown = 0.0, seed = 0):
+    rnd = random.Random(seed)
+    withdrawnList = sorted(withdrawnControls())
+    controls = [c for c in mf.NISTtoISO13 if c not in withdrawnList]
+    data = []
+    for i in range(rows):
+        if data and rnd.random() < repetition:
+            data.append(["CM" + str(i), rnd.choice(data)[1]])
+            continue
+        cell = []
+        for _ in range(rnd.randint(1, refs)):
+            r = rnd.random()
+            if r < unknown:
+                ref = "XX-" + str(rnd.randint(1, 99))
+            elif r < unknown + withdrawn:
+                ref = rnd.choice(withdrawnList)
+            else:
+                ref = rnd.choice(controls)
+            if rnd.random() < enhancements:
+                ref += "(" + str(rnd.randint(1, 20)) + ")"
+            cell.append(ref)
+        data.append(["CM" + str(i), ", ".join(cell)])
+    return data
+
+
+# NIST controls withdrawn from 800 53 rev 5
+def withdrawnControls():
+    return {c for c, isos in mf.NISTtoISO13.items() if isos == ["Withdrawed from 800 53 rev5"]}
+
+
+# writing of the synthetic inventory to a CSV file
+def writeInventory(path, data):
+    with open(path, 'w', newline='') as f:
+        csv.writer(f).writerows(data)
+
+
+# the cleaning as it was before the single pass tokenizer, for comparison
+def legacyCleanBefore(data):
+    for i in range(len(data)):
+        for j in range(len(data[i])):
+            data[i][j] = re.sub(r"\s+", '', str(data[i][j]))
+    for i in range(len(data)):
+        data[i][1] = data[i][1].split(',')
+    for i in range(len(data)):
+        for j in range(len(data[i][1])):
+            data[i][1][j] = re.sub(r"\([0-9]+\)", "", data[i][1][j])
+        data[i][1] = list(dict.fromkeys(data[i][1]))
+    return data
+
+
+# the writer as it was before the batched writer, for comparison
+def legacySave(path, data):
+    with open(path, 'w') as f:
+        writer = csv.writer(f)
+        for row in data:
+            lowstr = ""
+            for i in range(len(row[2])):
+                if i > 0:
+                    lowstr += ", " + row[2][i]
+                else:
+                    lowstr += row[2][i]
+            writer.writerow([row[0], lowstr])
+
+
+# time of a function in seconds
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+# a stage timed and, if memory is True, its peak of the traced memory
+def stage(results, name, memory, function, *args):
+    if memory:
+        tracemalloc.start()
+    seconds, result = timed(function, *args)
+    results[name] = {"seconds": round(seconds, 6)}
+    if memory:
+        results[name]["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+# the stages of Map one by one on a CSV file
+#   read_csv -> cleanBefore -> mapping -> cleanAfter -> save
+def benchStages(path, out, type = 1, memory = False):
+    results = {}
+    map = mf.Map(None, out, type, stream = True, cacheSize = 0)
+
+    def mapping(data):
+        for row in data:
+            map.mapRow(row)
+
+    def save(data):
+        with open(out, 'w') as f:
+            map.writeRows(f, data)
+
+    data = stage(results, "read_csv", memory, map.read_csv, path)
+    stage(results, "cleanBefore", memory, map.cleanBefore, data)
+    stage(results, "mapping", memory, mapping, data)
+    stage(results, "cleanAfter", memory, map.cleanAfter, data)
+    stage(results, "save", memory, save, data)
+    del data
+
+    # the whole mapping as done by mapper(), in memory and streamed
+    stage(results, "total", memory, lambda: mf.Map(path, out, type).save())
+    stage(results, "total_stream", memory, lambda: mf.Map(path, out, type, stream = True).save())
+
+    rows = sum(1 for _ in open(path))
+    for name in results:
+        results[name]["rows_per_second"] = round(rows / max(results[name]["seconds"], 1e-9))
+    return results
+
+
+# legacy cleaning against Map.cleanBefore (the single pass tokenizer)
+def benchCleanBefore(data):
+    map = mf.Map(None, None, 1, stream = True)
+
+    legacy, expected = timed(legacyCleanBefore, [list(row) for row in data])
+    tokenizer, result = timed(map.cleanBefore, [list(row) for row in data])
+    if result != expected:
+        raise AssertionError("cleanBefore differs from the legacy cleaning")
+    return {"legacy_seconds": round(legacy, 6), "tokenizer_seconds": round(tokenizer, 6)}
+
+
+# legacy writer against the batched writer of Map.save, the outputs
+# must be identical
+def benchSave(data, out):
+    map = mf.Map(None, None, 1, stream = True)
+    data = list(map.mapRows([list(row) for row in data]))
+    map._resPath = out + ".new"
+
+    legacy, _ = timed(legacySave, out, data)
+    map._stream = False
+    map._dataUser = data
+    batched, _ = timed(map.save)
+    with open(out, 'rb') as a, open(out + ".new", 'rb') as b:
+        if a.read() != b.read():
+            raise AssertionError("save differs from the legacy writer")
+    os.remove(out)
+    os.remove(out + ".new")
+    return {"legacy_seconds": round(legacy, 6), "batched_seconds": round(batched, 6)}
+
+
+# mapping without and with the cell cache
+def benchCache(data):
+    noCache = mf.Map(None, None, 1, stream = True, cacheSize = 0)
+    cache = mf.Map(None, None, 1, stream = True)
+    plain, expected = timed(list, noCache.mapRows([list(row) for row in data]))
+    cached, result = timed(list, cache.mapRows([list(row) for row in data]))
+    if result != expected:
+        raise AssertionError("the cached mapping differs")
+    return {"no_cache_seconds": round(plain, 6), "cache_seconds": round(cached, 6),
+            "cache": cache.cacheInfo()}
+
+
+# mapping without and with the validation, the best of the runs with new
+# Maps, the lenient validation must not change the mapped rows
+def benchValidation(data, runs = 3):
+    unvalidated = seconds = float("inf")
+    for _ in range(runs):
+        plain = mf.Map(None, None, 1, stream = True)
+        validated = mf.Map(None, None, 1, stream = True, validate = "lenient")
+        t, expected = timed(list, plain.mapRows([list(row) for row in data]))
+        unvalidated = min(unvalidated, t)
+        t, result = timed(list, validated.mapRows([list(row) for row in data]))
+        seconds = min(seconds, t)
+        if result != expected:
+            raise AssertionError("the validated mapping differs")
+    report = validated.validation()
+    return {"no_validation_seconds": round(unvalidated, 6), "validation_seconds": round(seconds, 6),
+            "overhead": round(seconds / unvalidated - 1, 4),
+            "invalid_rows": report["invalid_rows"], "errors": report["errors"]}
+
+
+# memory of the mapped rows kept by Map, as lists against the RowStore,
+# without the cell cache, which would be counted in the first one
+def benchStore(path):
+    map = mf.Map(None, None, 1, stream = True, cacheSize = 0)
+
+    def traced(function):
+        tracemalloc.start()
+        result = function()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size, result
+
+    lists, rows = traced(lambda: list(map.mapRows(map.readRows(path))))
+    store, result = traced(lambda: mf.RowStore(map.mapRows(map.readRows(path))))
+    if list(result) != rows:
+        raise AssertionError("the RowStore differs from the lists")
+    return {"lists_bytes": lists, "store_bytes": store, "ratio": round(lists / max(store, 1), 1)}
+
+
+# the inferred columns of small inventories, a headerless file whose first
+# reference is empty or unknown must keep its first row as data, returns
+# the number of the checked files
+SCHEMA_CASES = [
+    # rows, header, idColumn, refColumn
+    ([["CM1", ""], ["CM2", "AC-2"], ["CM3", "SI-4"]], False, 0, 1),
+    ([["CM1", "N/A"], ["CM2", "AC-2"], ["CM3", "SI-4"]], False, 0, 1),
+    ([["CM1", " AU-2 , "], ["CM2", "AC-2"], ["CM3", "SI-4"]], False, 0, 1),
+    ([["ID", "NIST Rev5 Controls"], ["CM2", "AC-2"], ["CM3", "SI-4"]], True, 0, 1),
+    ([["Owner", "Control ID", "Controls"]] + [["o" + str(i % 3), "C" + str(i), "AC-2"] for i in range(20)],
+     True, 1, 2),
+    ([["o" + str(i % 3), "C" + str(i), "AC-2"] for i in range(20)], False, 0, 2),
+    ([["CM1", "AC-1", "first note"], ["CM1", "AC-2", "second note"], ["CM2", "SI-4", "third note"]], False, 0, 1),
+]
+
+def checkSchema():
+    with tempfile.TemporaryDirectory(prefix="mapper-schema-") as directory:
+        path = os.path.join(directory, "inventory.csv")
+        for rows, header, idColumn, refColumn in SCHEMA_CASES:
+            writeInventory(path, rows)
+            schema = mf.inferSchema(path, 1)
+            found = (schema.header is not None, schema.idColumn, schema.refColumn)
+            if found != (header, idColumn, refColumn):
+                raise AssertionError(f"the columns of {rows[:2]} inferred as {found}")
+            map = mf.Map(path, None, 1)
+            if len(map.rows()) != len(rows) - header:
+                raise AssertionError(f"rows of {rows[:2]} lost")
+    return len(SCHEMA_CASES)
+
+# budget of the cold start of the command line over the bare interpreter
+COLD_START_BUDGET_MS = 50
+
+# cold start of "python -m mapper" on a small CSV in a new process against
+# the bare interpreter, the medians of the runs in milliseconds
+#   on a small CSV the mapping itself is negligible, the difference is the
+#   import of the module and the loading of the tables
+def benchColdStart(path, out, runs = 10):
+    def median(args):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(args, check=True, stdout=subprocess.DEVNULL,
+                           cwd=os.path.dirname(os.path.abspath(mf.__file__)))
+            times.append(time.perf_counter() - start)
+        return sorted(times)[len(times) // 2] * 1000
+
+    python = median([sys.executable, "-c", "pass"])
+    cli = median([sys.executable, "-m", "mapper", path, out])
+    return {"python_ms": round(python, 3), "cli_ms": round(cli, 3),
+            "overhead_ms": round(cli - python, 3), "budget_ms": COLD_START_BUDGET_MS,
+            "within_budget": cli - python <= COLD_START_BUDGET_MS}
+
+
+def run(args):
+    params = {"rows": args.rows, "refs": args.refs, "enhancements": args.enhancements,
+              "repetition": args.repetition, "withdrawn": args.withdrawn,
+              "unknown": args.unknown, "seed": args.seed}
+    data = syntheticRows(**params)
+
+    directory = tempfile.mkdtemp(prefix="mapper-bench-")
+    path = os.path.join(directory, "inventory.csv")
+    out = os.path.join(directory, "mapped.csv")
+    small = os.path.join(directory, "small.csv")
+    try:
+        writeInventory(path, data)
+        writeInventory(small, data[:100])
+        stages = benchStages(path, out, memory = args.memory)
+        save = benchSave(data, out)
+        store = benchStore(path)
+        coldStart = benchColdStart(small, out, args.cold_start_runs)
+    finally:
+        for p in (path, out, small):
+            if os.path.exists(p):
+                os.remove(p)
+        os.rmdir(directory)
+
+    return {"mapper_version": mf.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "params": params,
+            "stages": stages,
+            "cleanBefore": benchCleanBefore(data),
+            "save": save,
+            "cache": benchCache(data),
+            "validation": benchValidation(data),
+            "store": store,
+            "schema_cases": checkSchema(),
+            "cold_start": coldStart,
+            "peak_rss_kb": mf.peakRss()}
+
+
+def printResults(results):
+    print("inventory: " + ", ".join(k + " = " + str(v) for k, v in results["params"].items()))
+    print("stages:")
+    for name, s in results["stages"].items():
+        line = "\t %-13s %8.3f s  %10d rows/s" % (name, s["seconds"], s["rows_per_second"])
+        if "peak_bytes" in s:
+            line += "  peak %.1f MB" % (s["peak_bytes"] / 1e6)
+        print(line)
+    c = results["cleanBefore"]
+    print("cleanBefore:")
+    print("\t legacy:     %.3f s" % c["legacy_seconds"])
+    print("\t tokenizer:  %.3f s  (%.1fx)" % (c["tokenizer_seconds"], c["legacy_seconds"] / c["tokenizer_seconds"]))
+    c = results["save"]
+    print("save:")
+    print("\t legacy:     %.3f s" % c["legacy_seconds"])
+    print("\t batched:    %.3f s  (%.1fx)" % (c["batched_seconds"], c["legacy_seconds"] / c["batched_seconds"]))
+    c = results["cache"]
+    print("cell cache:")
+    print("\t no cache:   %.3f s" % c["no_cache_seconds"])
+    print("\t cache:      %.3f s  (%.1fx)" % (c["cache_seconds"], c["no_cache_seconds"] / c["cache_seconds"]))
+    print("\t " + str(c["cache"]))
+    c = results["validation"]
+    print("validation:")
+    print("\t none:       %.3f s" % c["no_validation_seconds"])
+    print("\t lenient:    %.3f s  (%+.1f %%, %d invalid rows)" % (c["validation_seconds"], c["overhead"] * 100,
+                                                                c["invalid_rows"]))
+    c = results["store"]
+    print("rows in memory:")
+    print("\t lists:      %.1f MB" % (c["lists_bytes"] / 1e6))
+    print("\t RowStore:   %.1f MB  (%.1fx)" % (c["store_bytes"] / 1e6, c["ratio"]))
+    print("inferred columns: %d files ok" % results["schema_cases"])
+    c = results["cold_start"]
+    print("cold start (100 rows):")
+    print("\t python:     %.1f ms" % c["python_ms"])
+    print("\t mapper:     %.1f ms  (+%.1f ms, budget %d ms%s)" % (c["cli_ms"], c["overhead_ms"], c["budget_ms"],
+                                                                 "" if c["within_budget"] else ", EXCEEDED"))
+    print("peak RSS: " + str(results["peak_rss_kb"]) + " kB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the mapper")
+    parser.add_argument("--rows", type=int, default=1000000, help="number of synthetic rows")
+    parser.add_argument("--refs", type=int, default=4, help="maximal number of references per row")
+    parser.add_argument("--enhancements", type=float, default=0.3, help="share of references with an enhancement")
+    parser.add_argument("--repetition", type=float, default=0.5, help="share of rows repeating a previous cell")
+    parser.add_argument("--withdrawn", type=float, default=0.02, help="share of references to withdrawn controls")
+    parser.add_argument("--unknown", type=float, default=0.02, help="share of references to unknown controls")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the generator")
+    parser.add_argument("--memory", action="store_true", help="trace the peak memory of every stage (slower)")
+    parser.add_argument("--cold-start-runs", type=int, default=10, help="runs of the cold start of the command line")
+    parser.add_argument("--json", help="write the results as JSON to this file")
+    parser.add_argument("--check", action="store_true", help="only check the inferred columns of small inventories")
+    args = parser.parse_args()
+
+    if args.check:
+        print("inferred columns: %d files ok" % checkSchema())
+        sys.exit(0)
+
+    results = run(args)
+    printResults(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
@@ -14,6 +14,9 @@ pathToSave = "test-iso.csv"
 #      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
 #      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
 #   printDetails = True/False, print the mapped list if True
+#   stream = True/False, optional, map the CSV row by row with a constant
+#            memory instead of loading it whole (useful for large files)
+#   workers = optional, number of processes mapping the CSV in parallel
 #
 #   accepted CSV format
 #   first column: your control 
@@ -25,6 +28,9 @@ pathToSave = "test-iso.csv"
 
 mf.mapper(myCSVtoMap, pathToSave, 1, True)
 
+# the same from the command line
+#   python -m mapper test.csv test-iso.csv --type 1 --details
+
 # this function print the mapping list
 #   type = type of mapping
 #      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
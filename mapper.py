@@ -15,9 +15,10 @@
     Note, if you map from NIST to ISO, then, by default a a more specific
     NIST 800 53 controls such as SI-4(14) will be generalised to SI-4 and
     then mapped.
-    This can be disabled by setting
-        self._NIST_generalisation = False
-    But then no mapping will be performed.
+    This can be disabled by generalise = False of mapper() or Map, the
+    references are then kept as they are, but the enhancements are still
+    mapped by their base control, or by a finer mapping registered by
+    registerOverrides().
 
 
 
@@ -25,7 +26,18 @@
 """
 
 import csv
+import functools
+import io
+import os
 import re
+import sys
+import time
+from collections import deque
+from itertools import islice
+from operator import itemgetter
+from collections.abc import Mapping
+
+__version__ = "0.1"
 
 # the main mapping function
 # arguments:
@@ -35,22 +47,68 @@ import re
 #      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
 #      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
 #   printDetails = True/False, print the mapped list if True
-def mapper(input, output, type, printDetails):
+#   source, target = optional, names of the frameworks instead of the type,
+#            e.g. source = NIST800_53R5, target = ISO27001_2013, see frameworks()
+#   stream = True/False, if True the rows are read, mapped and written
+#            one by one, so the memory does not grow with the input file
+#   workers = number of processes mapping the chunks of the input CSV in
+#             parallel, 1 maps in the current process
+#   metrics = optional, a function called with the report of the stage times
+#             and counters, or a path of a JSON (or ".prom") file, see Metrics
+#   compression = optional, "gzip" or "zstd" compressed output, by default
+#             by the suffix of the output (".gz" or ".zst")
+#   format = optional, "csv", "jsonl", "arrow" or "parquet", by default by
+#            the suffix of the output (".jsonl", ".arrow", ".parquet", ...)
+#   incremental = True/False or a path of the sidecar index, if set only the
+#            rows changed since the previous run are mapped, see Map
+#   coverage = optional, path of a JSON report of the covered, uncovered and
+#            over-covered controls of the target framework, see Coverage
+#   generalise = True/False, if False the references such as SI-4(14) are
+#            not replaced by their base control, see Map
+#   validate = optional, "strict", "lenient" or "skip", the rows are
+#            validated and the errors printed, see Validator
+#   encoding = encoding of the input CSV, "utf-8" by default, see CsvFile
+#   header, idColumn, refColumn, keep = the columns of the input CSV, by
+#            default inferred, see inferSchema
+#   the errors of reading and writing are raised, e.g. FileNotFoundError
+def mapper(input, output, type = None, printDetails = False, stream = False, workers = 1,
+           source = None, target = None, metrics = None, compression = None, format = None,
+           incremental = None, coverage = None, generalise = True, validate = None,
+           encoding = "utf-8", header = None, idColumn = None, refColumn = None, keep = ()):
 
     print("Mapping: ")
-    if(type == 0):
+    if source is not None or target is not None:
+        print("\t\t " + str(source) + " -> " + str(target))
+    elif(type == 0):
         print("\t\t ISO 27001:2022  ->  NIST 800 53 rev 5")
     else:
         print("\t\t NIST 800 53 rev 5 -> ISO 27001:2013")
 
     print("Running... ")    
 
-    map = Map(input, output, type)
+    map = Map(input, output, type, stream, workers, source = source, target = target,
+              metrics = metrics, incremental = incremental or None, generalise = generalise,
+              validate = validate, encoding = encoding,
+              header = header, idColumn = idColumn, refColumn = refColumn, keep = keep)
 
     if(printDetails):
         map.print()
 
-    map.save()
+    map.save(compression, format)
+
+    if map.changeInfo() is not None:
+        print("Changed rows: ", map.changeInfo()["mapped"], " of ", map.changeInfo()["rows"])
+
+    if map.validation() is not None:
+        report = map.validation()
+        print("Invalid rows: ", report["invalid_rows"], " of ", report["rows"], ", errors: ", report["errors"])
+        for e in report["reported"][:10]:
+            print("\t row " + str(e["row"]) + ", column " + str(e["column"]) + ": " + e["reason"] + " '" + e["value"] + "'")
+
+    if coverage is not None:
+        result = map.coverage()
+        result.write(coverage)
+        print("Covered controls: ", result.report()["covered_controls"], " of ", len(result.controls))
 
     print("Finsihed and saved to: ", output)
 
@@ -66,10 +124,9 @@ def printMap(type):
     print("Map: ")
     if(type == 0):
         print("\t\t ISO 27001:2013  ->  NIST 800 53 rev 5") 
-        printMap = ISO13toNIST     
     else:
         print("\t\t NIST 800 53 rev 5 -> ISO 27001:2013") 
-        printMap = NISTtoISO13
+    printMap = mappingList(type)
 
     for key in printMap:
         prnt = key + " => "
@@ -81,51 +138,1140 @@ def printMap(type):
         print(prnt)
 
 
+# the compiled mapping engine
+#   it is built once from a mapping list (NISTtoISO13 or ISO13toNIST),
+#   every control gets an integer code and the mapped controls of each code
+#   are kept as a sorted tuple with the "" and 'None' entries removed,
+#   a row with several controls is then mapped by a single set union
+#   overrides = optional, finer mappings of enhancements, {"SI-4(14)": [...]},
+#               used instead of the mapping of their base control
+#
+#   engine = getEngine(1)
+#   engine.mapRow(['CP-13', 'PE-18'])          -> ('A.11.1.4', 'A.11.2.1', ...)
+#   engine.mapRow(['SI-4(14)'])                -> the mapping of SI-4
+#   engine.mapBatch([['SI-3'], ['SC-26']])     -> [('A.12.2.1',), ('None',)]
+class MapEngine:
+
+    # entries of the mapping lists which are not controls
+    SENTINELS = ("", "None")
+
+    # maximal number of the enhancements kept in the enhancement index
+    ENHANCEMENTS = 65536
+
+    def __init__(self, dataMap, overrides = None):
+        self._codes = {}        # control -> code
+        self._controls = []     # code -> control
+        self._targets = []      # code -> frozenset of the mapped controls
+        self._sorted = []       # code -> sorted tuple of the mapped controls
+
+        self._none = ("None",)
+        for mapping in (dataMap, overrides or {}):
+            for key in mapping:
+                targets = frozenset(sys.intern(t) for t in mapping[key] if t not in self.SENTINELS)
+                code = self._codes.get(key)
+                if code is None:
+                    self._codes[sys.intern(key)] = len(self._controls)
+                    self._controls.append(key)
+                    self._targets.append(targets)
+                    self._sorted.append(tuple(sorted(targets)) or self._none)
+                else:
+                    self._targets[code] = targets
+                    self._sorted[code] = tuple(sorted(targets)) or self._none
+
+        # the enhancement index, an enhancement -> the control it is mapped
+        # by, i.e. itself if it has an own (finer) mapping, otherwise its base
+        # control, e.g. SI-4(14) -> SI-4, the enhancements with an own
+        # mapping are there from the start, the other ones are added when
+        # they are met, so each is resolved only once
+        self._enhancements = {c: c for c in self._controls if "(" in c}
+
+    def __len__(self):
+        return len(self._controls)
+
+    # the control an enhancement is mapped by, see the enhancement index,
+    # other controls are returned as they are
+    def generalise(self, control):
+        ref = self._enhancements.get(control)
+        if ref is None:
+            if "(" not in control:
+                return control
+            ref = control if control in self._codes else _ENHANCEMENT.sub("", control)
+            if len(self._enhancements) < self.ENHANCEMENTS:
+                self._enhancements[control] = ref
+        return ref
+
+    # single pass tokenizer of a cell with the references, as tokenize()
+    # but the enhancements are generalised by the enhancement index, i.e.
+    # the ones with an own mapping are kept
+    def tokenize(self, cell, generalise = True):
+        tokens = "".join(cell.split()).split(',')
+        if not generalise:
+            return tokens
+        if "(" in cell:
+            get = self._enhancements.get
+            tokens = [(get(t) or self.generalise(t)) if "(" in t else t for t in tokens]
+        return list(dict.fromkeys(tokens))
+
+    # integer code of a control, None for an unknown control
+    #   an enhancement without an own mapping has the code of its base control
+    def code(self, control):
+        code = self._codes.get(control)
+        if code is None and "(" in control:
+            return self._codes.get(self.generalise(control))
+        return code
+
+    # control of an integer code
+    def control(self, code):
+        return self._controls[code]
+
+    # integer codes of a list of controls, the unknown controls are dropped
+    #   the enhancement index is used only if some control is not known
+    def encode(self, refs):
+        get = self._codes.get
+        codes = [c for c in map(get, refs) if c is not None]
+        if len(codes) < len(refs):
+            code = self.code
+            return [c for c in map(code, refs) if c is not None]
+        return codes
+
+    # mapping of a list of integer codes
+    def mapCodes(self, codes):
+        if len(codes) == 1:
+            return self._sorted[codes[0]]
+        targets = set().union(*[self._targets[c] for c in codes])
+        if not targets:
+            return self._none
+        return tuple(sorted(targets))
+
+    # mapping of a list of controls (a single row)
+    def mapRow(self, refs):
+        return self.mapCodes(self.encode(refs))
+
+    # mapping of a list of rows, each row is a list of controls
+    def mapBatch(self, rows):
+        mapRow = self.mapRow
+        return [mapRow(refs) for refs in rows]
+
+
+# compiled engines for the (source, target) frameworks, built on the first use
+_engines = {}
+
+# finer mappings of enhancements, (source, target) -> {enhancement: [controls]}
+_overrides = {}
+
+# registration of finer mappings of single enhancements, they are mapped
+# by them instead of by their base control
+#   registerOverrides(NIST800_53R5, ISO27001_2013, {"SI-4(14)": ["A.12.4.1"]})
+def registerOverrides(source, target, overrides):
+    _overrides.setdefault((source, target), {}).update(
+        {"".join(key.split()): list(overrides[key]) for key in overrides})
+    _engines.pop((source, target), None)
+
+# the finer mappings of enhancements of a map type, see registerOverrides
+def enhancementOverrides(type):
+    return dict(_overrides.get(mapDirection(type), {}))
+
+# returns the compiled mapping engine
+#   type = type of mapping
+#      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
+#      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
+#      (source, target) frameworks of a registered catalogue
+def getEngine(type):
+    direction = mapDirection(type)
+    engine = _engines.get(direction)
+    if engine is None:
+        engine = MapEngine(catalogue(*direction), _overrides.get(direction))
+        _engines[direction] = engine
+    return engine
+
+
+# the segments of a control ID, its path in the hierarchy of a framework
+#   AC-2(3) -> AC, 2, 3     A.9.2.1 -> A, 9, 2, 1     7.5.1 -> 7, 5, 1
+_SEGMENTS = re.compile(r"[^.\-()]+")
+
+# query engine over a compiled mapping, the family/prefix and wildcard
+# queries of the source and target controls and the lookups between them
+#   both sides are indexed once by a trie of the segments of the control
+#   IDs (families, clauses and their subclauses), every node keeps all the
+#   controls below it, so a query is a walk of a few nodes and a union of
+#   their lists, the results are cached per query
+#   a pattern is a control or a family of the hierarchy, all the controls
+#   below it are matched, "AC" matches AC-1, AC-2, AC-2(3), ..., "A.9"
+#   matches A.9.1.1, ..., but not A.10; a segment "*" (or "x") matches any
+#   segment, e.g. 7.5.x, other wildcards of fnmatch match inside a segment,
+#   e.g. AC-1* (AC-1, AC-10, ...); patterns separated by "," are combined
+#
+#   query = getQuery(1)
+#   query.forward("AC")         -> ISO controls reachable from the AC family
+#   query.reverse("A.9")        -> NIST controls mapped to anything under A.9
+#   query.reverse("7.5.x")      -> NIST controls mapped to 7.5.1, 7.5.2, ...
+#   query.sources("SI-4*")      -> the NIST controls SI-4, SI-4(14), ...
+class MapQuery:
+
+    # maximal number of the cached queries
+    QUERIES = 4096
+
+    # segments matching any segment
+    WILDCARDS = ("*", "x", "X")
+
+    def __init__(self, engine):
+        self._engine = engine
+        controls = engine._controls
+        self._reverse = {}      # target -> codes of the sources mapped to it
+        for code, targets in enumerate(engine._targets):
+            for target in targets:
+                if target not in NOTES:
+                    self._reverse.setdefault(target, []).append(code)
+        self._sourceIndex = self._trie(enumerate(controls), controls)
+        self._targetIndex = self._trie(enumerate(self._reverse), list(self._reverse))
+        self._cached = functools.lru_cache(maxsize=self.QUERIES)(self._query)
+
+    # the trie of the controls, a node is ({segment: node}, [controls
+    # below]), the controls are given as numbers of the list ids
+    @staticmethod
+    def _trie(items, ids):
+        import array
+        root = ({}, array.array('i'))
+        for number, id in items:
+            node = root
+            node[1].append(number)
+            for segment in _SEGMENTS.findall(id):
+                node = node[0].setdefault(segment, ({}, array.array('i')))
+                node[1].append(number)
+        return root, ids
+
+    # the numbers of the controls of an index matching a pattern
+    def _match(self, index, pattern):
+        root, ids = index
+        found = set()
+        for part in "".join(pattern.split()).split(','):
+            segments = _SEGMENTS.findall(part)
+            if not segments:
+                continue
+            nodes = [root]
+            for segment in segments:
+                if segment in self.WILDCARDS:
+                    nodes = [child for children, _ in nodes for child in children.values()]
+                elif any(c in segment for c in "*?["):
+                    from fnmatch import fnmatchcase
+                    nodes = [child for children, _ in nodes for name, child in children.items()
+                             if fnmatchcase(name, segment)]
+                else:
+                    nodes = [children[segment] for children, _ in nodes if segment in children]
+                if not nodes:
+                    break
+            for _, numbers in nodes:
+                found.update(numbers)
+        return found
+
+    # the results in the natural order of the controls, see controlKey, the
+    # notes of the mapping lists such as withdrawn controls are not controls
+    def _query(self, kind, pattern):
+        if kind == "sources":
+            controls = self._engine._controls
+            return tuple(sorted((controls[code] for code in self._match(self._sourceIndex, pattern)),
+                                key=controlKey))
+        targets = self._targetIndex[1]
+        if kind == "targets":
+            return tuple(sorted((targets[number] for number in self._match(self._targetIndex, pattern)),
+                                key=controlKey))
+        if kind == "forward":
+            engineTargets = self._engine._targets
+            found = set()
+            for code in self._match(self._sourceIndex, pattern):
+                found.update(engineTargets[code])
+            found.difference_update(NOTES)
+            return tuple(sorted(found, key=controlKey))
+        if kind == "reverse":
+            controls = self._engine._controls
+            reverse = self._reverse
+            found = set()
+            for number in self._match(self._targetIndex, pattern):
+                found.update(reverse[targets[number]])
+            return tuple(sorted((controls[code] for code in found), key=controlKey))
+        raise ValueError(f"Unknown query '{kind}'")
+
+    # the source controls matching the pattern
+    def sources(self, pattern):
+        return self._cached("sources", pattern)
+
+    # the target controls matching the pattern, i.e. mapped by some control
+    def targets(self, pattern):
+        return self._cached("targets", pattern)
+
+    # the target controls reachable from the source controls matching the
+    # pattern, e.g. all the ISO controls of the AC family
+    def forward(self, pattern):
+        return self._cached("forward", pattern)
+
+    # the source controls mapped to any target control matching the pattern,
+    # e.g. all the NIST controls mapped to anything under A.9
+    def reverse(self, pattern):
+        return self._cached("reverse", pattern)
+
+    # a query by its kind, "sources", "targets", "forward" or "reverse"
+    def query(self, kind, pattern):
+        if kind not in ("sources", "targets", "forward", "reverse"):
+            raise ValueError(f"Unknown query '{kind}'")
+        return self._cached(kind, pattern)
+
+    # hits, misses and the size of the cache of the queries
+    def cacheInfo(self):
+        info = self._cached.cache_info()
+        return {"hits": info.hits, "misses": info.misses,
+                "size": info.currsize, "maxsize": self.QUERIES}
+
+
+_queries = {}
+
+# returns the query engine of a map type, see MapQuery, it is built once
+# from the compiled mapping and again when the mapping is registered anew
+#   type = as in getEngine
+def getQuery(type):
+    engine = getEngine(type)
+    direction = mapDirection(type)
+    query = _queries.get(direction)
+    if query is None or query._engine is not engine:
+        query = MapQuery(engine)
+        _queries[direction] = query
+    return query
+
+
+# precompiled NIST control enhancement, e.g. "(14)" in SI-4(14)
+_ENHANCEMENT = re.compile(r"\([0-9]+\)")
+
+# single pass tokenizer of a cell with the references
+#   removes all white spaces, splits the cell on "," and if generalise
+#   is True, generalises the enhancements such as SI-4(14) to SI-4 and
+#   removes the duplicates, the regex is used only for the tokens with "(",
+#   Map uses MapEngine.tokenize, which resolves them by a lookup instead
+#
+#   tokenize(" CP-13, SI-4(14) ,SI-4")     -> ['CP-13', 'SI-4']
+def tokenize(cell, generalise = True):
+    tokens = "".join(cell.split()).split(',')
+    if not generalise:
+        return tokens
+    if "(" in cell:
+        sub = _ENHANCEMENT.sub
+        tokens = [sub("", t) if "(" in t else t for t in tokens]
+    return list(dict.fromkeys(tokens))
+
+
+# mapping of a raw reference cell, the cleaned references and the mapped
+# controls are returned as tuples with True if all the cleaned references
+# are known controls, the usual valid cell, see Validator.checkMap
+#   the flag is the check of MapEngine.encode, the lookup is not repeated
+def _mapCell(type, generalise, cell):
+    engine = getEngine(type)
+    refs = engine.tokenize(cell, generalise)
+    codes = [c for c in map(engine._codes.get, refs) if c is not None]
+    known = len(codes) == len(refs)
+    if not known:
+        codes = engine.encode(refs)
+    return tuple(refs), engine.mapCodes(codes), known
+
+
+# a bounded LRU cache of the mapped reference cells
+#   inventories repeat the same cells (e.g. "CP-13, PE-18") over and over,
+#   with the cache each distinct cell is cleaned and mapped only once,
+#   the key is the map type, the generalisation and the raw cell
+#
+#   cache = CellCache(1000)
+#   cache(1, True, "CP-13, PE-18")     -> (('CP-13', 'PE-18'), ('A.11.1.4', ...), True)
+#   cache.info()                       -> {'hits': 0, 'misses': 1, ...}
+class CellCache:
+    def __init__(self, size = 65536):
+        self._size = size
+        self._cached = functools.lru_cache(maxsize=size)(_mapCell)
+
+    def __call__(self, type, generalise, cell):
+        return self._cached(type, generalise, cell)
+
+    # the counters of the cache, every miss stores a cell, so once the
+    # cache is full, every miss evicts the least recently used one
+    def info(self):
+        info = self._cached.cache_info()
+        calls = info.hits + info.misses
+        return {"hits": info.hits,
+                "misses": info.misses,
+                "evictions": info.misses - info.currsize,
+                "hit_rate": round(info.hits / calls, 6) if calls else 0.0,
+                "size": info.currsize,
+                "maxsize": self._size}
+
+    def clear(self):
+        self._cached.cache_clear()
+
+
+# opt-in instrumentation of a Map
+#   the stages of the pipeline (read, clean, map, write) are timed, wall and
+#   CPU time, the references are counted and the report is passed to a sink
+#   sink = function called with the report (a dict), or a path of a file,
+#          the report is written as Prometheus text if the path ends with
+#          ".prom", as JSON otherwise, or None to get it by Map.metrics()
+#
+#   Map("in.csv", "out.csv", 1, metrics = print).save()
+#   Map("in.csv", "out.csv", 1, metrics = "metrics.prom").save()
+#
+#   nothing of this is used if the metrics of a Map are not enabled
+class Metrics:
+    def __init__(self, sink = None):
+        self.sink = sink
+        # stage -> [wall, CPU time, rows, upstream stage], the times include
+        # the upstream stage, it is subtracted in the report
+        self.stages = {}
+        self.rows = 0
+        self.tokens = 0
+        self.unknown = 0
+        self.empty = 0
+        self.info = {}
+        self._start = time.perf_counter()
+        self._cpuStart = time.process_time()
+        self._wall = None
+        self._cpu = None
+
+    # a stage of the pipeline, the rows are passed through and the time
+    # spent in getting each of them is measured
+    def stage(self, name, rows, upstream = None):
+        perf = time.perf_counter
+        cpu = time.process_time
+        s = self.stages.setdefault(name, [0.0, 0.0, 0, upstream])
+        rows = iter(rows)
+        while True:
+            w = perf()
+            c = cpu()
+            try:
+                row = next(rows)
+            except StopIteration:
+                s[0] += perf() - w
+                s[1] += cpu() - c
+                return
+            s[0] += perf() - w
+            s[1] += cpu() - c
+            s[2] += 1
+            yield row
+
+    # a stage done by a single call, e.g. reading of the whole CSV
+    def block(self, name, function, *args, upstream = None):
+        s = self.stages.setdefault(name, [0.0, 0.0, 0, upstream])
+        w = time.perf_counter()
+        c = time.process_time()
+        result = function(*args)
+        s[0] += time.perf_counter() - w
+        s[1] += time.process_time() - c
+        if isinstance(result, int):
+            s[2] += result
+        elif isinstance(result, list):
+            s[2] += len(result)
+        return result
+
+    # counting of the rows and the references of the cleaned rows,
+    # references not in the mapping list are the unknown controls
+    def count(self, rows, engine):
+        code = engine.code
+        for row in rows:
+            self.rows += 1
+            for ref in row[1]:
+                if ref == "":
+                    self.empty += 1
+                else:
+                    self.tokens += 1
+                    if code(ref) is None:
+                        self.unknown += 1
+            yield row
+
+    # the raw counters, e.g. to be sent from a worker process
+    def counters(self):
+        return {"stages": self.stages, "rows": self.rows, "tokens": self.tokens,
+                "unknown": self.unknown, "empty": self.empty}
+
+    # adding of the counters of another Metrics (of a worker process)
+    def merge(self, counters):
+        for name, (wall, cpu, rows, upstream) in counters["stages"].items():
+            s = self.stages.setdefault(name, [0.0, 0.0, 0, upstream])
+            s[0] += wall
+            s[1] += cpu
+            s[2] += rows
+        self.rows += counters["rows"]
+        self.tokens += counters["tokens"]
+        self.unknown += counters["unknown"]
+        self.empty += counters["empty"]
+
+    # end of the measurement, the report is passed to the sink
+    #   info = further entries of the report, e.g. the cache counters
+    def finish(self, **info):
+        self._wall = time.perf_counter() - self._start
+        self._cpu = time.process_time() - self._cpuStart
+        self.info.update(info)
+        self.emit()
+
+    def report(self):
+        wall = self._wall if self._wall is not None else time.perf_counter() - self._start
+        cpu = self._cpu if self._cpu is not None else time.process_time() - self._cpuStart
+        stages = {}
+        for name in sorted(self.stages, key=self._order):
+            w, c, rows, upstream = self.stages[name]
+            if upstream in self.stages:
+                w -= self.stages[upstream][0]
+                c -= self.stages[upstream][1]
+            stages[name] = {"wall_seconds": round(max(w, 0.0), 6),
+                            "cpu_seconds": round(max(c, 0.0), 6),
+                            "rows": rows}
+        report = {"wall_seconds": round(wall, 6),
+                  "cpu_seconds": round(cpu, 6),
+                  "rows": self.rows,
+                  "tokens": self.tokens,
+                  "unknown_controls": self.unknown,
+                  "empty_references": self.empty,
+                  "rows_per_second": round(self.rows / wall, 1) if wall > 0 else 0.0,
+                  "tokens_per_second": round(self.tokens / wall, 1) if wall > 0 else 0.0,
+                  "stages": stages,
+                  "peak_rss_kb": peakRss()}
+        report.update(self.info)
+        return report
+
+    # the stages of the pipeline in their order, other stages at the end
+    _STAGES = ("read", "clean", "map", "clean_map", "write")
+
+    def _order(self, name):
+        return self._STAGES.index(name) if name in self._STAGES else len(self._STAGES)
+
+    # the report in the Prometheus text format
+    def prometheus(self, report = None):
+        if report is None:
+            report = self.report()
+        lines = []
+        def metric(name, kind, value, labels = ""):
+            if value is None:
+                return
+            if not any(l.startswith("# TYPE " + name + " ") for l in lines):
+                lines.append("# TYPE " + name + " " + kind)
+            lines.append(name + labels + " " + str(value))
+        metric("mapper_wall_seconds", "gauge", report["wall_seconds"])
+        metric("mapper_cpu_seconds", "gauge", report["cpu_seconds"])
+        metric("mapper_rows_total", "counter", report["rows"])
+        metric("mapper_tokens_total", "counter", report["tokens"])
+        metric("mapper_unknown_controls_total", "counter", report["unknown_controls"])
+        metric("mapper_empty_references_total", "counter", report["empty_references"])
+        metric("mapper_rows_per_second", "gauge", report["rows_per_second"])
+        metric("mapper_tokens_per_second", "gauge", report["tokens_per_second"])
+        for name, s in report["stages"].items():
+            labels = '{stage="' + name + '"}'
+            metric("mapper_stage_wall_seconds", "gauge", s["wall_seconds"], labels)
+            metric("mapper_stage_cpu_seconds", "gauge", s["cpu_seconds"], labels)
+            metric("mapper_stage_rows_total", "counter", s["rows"], labels)
+        cache = report.get("cache")
+        if cache:
+            metric("mapper_cache_hits_total", "counter", cache["hits"])
+            metric("mapper_cache_misses_total", "counter", cache["misses"])
+            metric("mapper_cache_evictions_total", "counter", cache["evictions"])
+            metric("mapper_cache_hit_rate", "gauge", cache["hit_rate"])
+        metric("mapper_peak_rss_kb", "gauge", report["peak_rss_kb"])
+        return "\n".join(lines) + "\n"
+
+    # passing of the report to the sink
+    def emit(self):
+        if self.sink is None:
+            return
+        report = self.report()
+        if callable(self.sink):
+            self.sink(report)
+            return
+        path = os.fspath(self.sink)
+        with open(path, 'w') as f:
+            if path.endswith(".prom"):
+                f.write(self.prometheus(report))
+            else:
+                import json
+                json.dump(report, f, indent=2)
+
+
+# peak resident memory of the process in kB, None where it is not available
+def peakRss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kB elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+# size of the output buffer and number of the rows written at once
+_WRITE_BUFFER = 1 << 20
+_WRITE_BATCH = 4096
+
+# opening of the output CSV for writing
+#   compression = None (by the suffix of the path, ".gz" or ".zst"),
+#                 "gzip", "zstd" or "none"
+#   zstd needs the zstandard package
+def openOutput(path, compression = None):
+    if compression is None:
+        if path.endswith(".gz"):
+            compression = "gzip"
+        elif path.endswith(".zst"):
+            compression = "zstd"
+        else:
+            compression = "none"
+
+    if compression == "gzip":
+        import gzip
+        return gzip.open(path, 'wt', compresslevel=6)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("The zstd compression needs zstandard, install it by: pip install zstandard")
+        return zstandard.open(path, 'wt')
+    if compression == "none":
+        return open(path, 'w', buffering=_WRITE_BUFFER)
+    raise ValueError(f"Unknown compression '{compression}'")
+
+
+# formats of the output by the suffix, the compression suffix is ignored
+#   csv     the id and the mapped controls joined by ", " (default)
+#   jsonl   JSON Lines, {"id": ..., "references": [...], "mapped": [...]}
+#   arrow   Arrow IPC file with list<string> columns, needs pyarrow
+#   parquet Parquet with list<string> columns, needs pyarrow
+FORMATS = ("csv", "jsonl", "arrow", "parquet")
+_FORMAT_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl",
+                    ".arrow": "arrow", ".feather": "arrow", ".ipc": "arrow",
+                    ".parquet": "parquet"}
+
+# number of the rows in one record batch of the Arrow and Parquet output
+_RECORD_BATCH = 65536
+
+# format of the output by the suffix of its path, "csv" if unknown
+def outputFormat(path):
+    name = path.lower()
+    for suffix in (".gz", ".zst"):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return _FORMAT_SUFFIXES.get(os.path.splitext(name)[1], "csv")
+
+
+# pyarrow is needed only by the Arrow and Parquet output, it is imported
+# on the first use
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("The Arrow and Parquet output needs pyarrow, install it by: pip install pyarrow")
+    return pyarrow
+
+
+# the incremental mapping
+#   a sidecar index of the previous run keeps for every control ID the hash
+#   of its raw reference cell and the mapped result, rows with the same hash
+#   are not mapped again, the index is valid only for the same mapping table
+_CHANGE_INDEX_VERSION = 2
+
+# hash of a raw reference cell
+def cellDigest(cell):
+    import hashlib
+    return hashlib.blake2b(cell.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+# hash of a mapping table, i.e. of the direction, the mapping list, the
+# generalisation and the overrides of enhancements, a change of any of them
+# invalidates the sidecar index
+def mappingDigest(type, mappingList, generalisation = True, overrides = None):
+    import hashlib
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((_CHANGE_INDEX_VERSION, mapDirection(type), bool(generalisation))).encode())
+    for control in sorted(mappingList):
+        h.update(repr((control, list(mappingList[control]))).encode())
+    for control in sorted(overrides or {}):
+        h.update(repr(("override", control, list(overrides[control]))).encode())
+    return h.hexdigest()
+
+# loading of the sidecar index, {id: (hash, references, mapped)}
+#   an empty index if it is missing, broken or of another mapping table
+#   the index is read by marshal, which builds only plain data (bytes,
+#   strings, tuples, dicts), unlike pickle it cannot run code of a file
+#   planted next to the output
+def loadChangeIndex(path, table):
+    import marshal
+    try:
+        with open(path, 'rb') as f:
+            version, cachedTable, rows = marshal.load(f)
+        if version == _CHANGE_INDEX_VERSION and cachedTable == table and isinstance(rows, dict):
+            return rows
+    except Exception:
+        # missing or broken index, everything is mapped again
+        pass
+    return {}
+
+# writing of the sidecar index, the old one is replaced at once
+def saveChangeIndex(path, table, rows):
+    import marshal
+    tmp = path + "." + str(os.getpid())
+    with open(tmp, 'wb') as f:
+        marshal.dump((_CHANGE_INDEX_VERSION, table, rows), f)
+    os.replace(tmp, path)
+
+
+# syntax of the control IDs of the frameworks, checked by Validator
+#   the frameworks without an entry are checked by _CONTROL_SYNTAX
+CONTROL_SYNTAX = {
+    "NIST800-53r5": r"[A-Z]{2}-[0-9]+(\([0-9]+\))*",
+    "ISO27001:2013": r"(A\.)?[0-9]+(\.[0-9]+)*",
+}
+_CONTROL_SYNTAX = r"[A-Za-z0-9][\w.:/()\-]*"
+
+
+# an error of the validation in the strict mode, errors are the reported
+# errors, see Validator
+class ValidationError(ValueError):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+    def __str__(self):
+        e = self.errors[0]
+        return f"Row {e['row']}, column {e['column']}: {e['reason']} '{e['value']}'"
+
+    # the rows numbered from a chunk of the input, moved by its first row
+    def shift(self, rows):
+        for error in self.errors:
+            error["row"] += rows
+
+
+# validation of the raw CSV rows, streamed in front of the mapping
+#   the control ID (column 1) must not be empty or start with a byte order
+#   mark, the references (column 2) must be there, every reference must
+#   have the syntax of the source framework (a precompiled regex, see
+#   CONTROL_SYNTAX) and be known to the mapping
+#   policy:
+#      "strict"   the first error raises ValidationError
+#      "lenient"  the errors are reported, all the rows are mapped, a row
+#                 without the references is mapped as having none
+#      "skip"     the errors are reported, the invalid rows are left out
+#   only the first maxErrors errors are kept in the report, all are counted
+#   the problems of a reference cell are kept for the repeated cells, so
+#   each distinct cell is checked once
+#
+#   validator = Validator(1, "skip")
+#   rows = validator.check(rows)
+#   validator.report()     -> {"rows": ..., "errors": ..., "reported": [{"row": 3, "column": 2, ...}]}
+class Validator:
+
+    POLICIES = ("strict", "lenient", "skip")
+
+    # maximal number of the distinct cells whose problems are kept
+    CELLS = 65536
+
+    def __init__(self, type, policy = "lenient", maxErrors = 1000):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown validation policy '{policy}'")
+        self.policy = policy
+        self.maxErrors = maxErrors
+        self._type = type
+        self._syntax = re.compile(CONTROL_SYNTAX.get(mapDirection(type)[0], _CONTROL_SYNTAX)).fullmatch
+        self._code = getEngine(type).code
+        self._get = getEngine(type)._codes.get
+        self._cells = {}
+        self.reset()
+
+    # clearing of the counters and the errors, e.g. before another pass
+    def reset(self):
+        self.rows = 0
+        self.invalidRows = 0
+        self.count = 0
+        self.errors = []
+
+    # the rows checked one by one, the invalid ones are left out by "skip"
+    #   a row with a known valid cell and an ID starting with a letter or a
+    #   digit costs a single lookup, only the other rows are checked in full
+    def check(self, rows):
+        problems = self.problems
+        get = self._cells.get
+        skip = self.policy == "skip"
+        valid = ()
+        for row in rows:
+            self.rows += 1
+            if len(row) > 1 and get(row[1]) is valid and row[0][:1].isalnum():
+                yield row
+                continue
+            found = problems(row)
+            if found:
+                self._report(found)
+                if skip:
+                    continue
+                if len(row) < 2:
+                    row.extend([""] * (2 - len(row)))
+            yield row
+
+    # the rows checked and mapped in one pass by mapRow (Map.cleanMapRowKnown),
+    # which maps a row in place and returns None if the row is surely valid,
+    # all its cleaned references are known (the flag is cached with the
+    # mapping of the cell), so a valid row costs no lookup of its own, the
+    # other rows are checked in full by their raw (id, references)
+    def checkMap(self, rows, mapRow):
+        problems = self.problems
+        skip = self.policy == "skip"
+        number = self.rows
+        try:
+            for number, row in enumerate(rows, number + 1):
+                try:
+                    raw = mapRow(row)
+                except IndexError:
+                    self.rows = number
+                    self._report(problems(row))
+                    if skip:
+                        continue
+                    row.extend([""] * (2 - len(row)))
+                    raw = mapRow(row)
+                    yield row
+                    continue
+                if raw is None:
+                    yield row
+                    continue
+                self.rows = number
+                found = problems(raw)
+                if found:
+                    self._report(found)
+                    if skip:
+                        continue
+                yield row
+        finally:
+            self.rows = number
+
+    # problems of a raw row, a tuple of (column, reason, value)
+    def problems(self, row):
+        if len(row) < 2:
+            if not row:
+                return ((1, "empty row", ""),)
+            return ((2, "missing references", ""),)
+
+        cell = row[1]
+        found = self._cells.get(cell)
+        if found is None:
+            found = self._checkCell(cell)
+            if len(self._cells) < self.CELLS:
+                self._cells[cell] = found
+
+        id = row[0]
+        if id[:1] == "\ufeff":
+            found = ((1, "byte order mark", id),) + found
+        elif not id.strip():
+            found = ((1, "empty control ID", id),) + found
+        return found
+
+    def _checkCell(self, cell):
+        tokens = "".join(cell.split()).split(',')
+        # the usual cell, all its references are known controls
+        if None not in map(self._get, tokens):
+            return ()
+        if tokens == [""]:
+            return ((2, "no references", cell),)
+        found = []
+        for token in tokens:
+            if token == "":
+                found.append((2, "empty reference", cell))
+            elif self._code(token) is None:
+                if self._syntax(token):
+                    found.append((2, "unknown control", token))
+                else:
+                    found.append((2, "invalid control syntax", token))
+        return tuple(found)
+
+    def _report(self, found):
+        self.invalidRows += 1
+        self.count += len(found)
+        for column, reason, value in found:
+            if len(self.errors) >= self.maxErrors:
+                break
+            self.errors.append({"row": self.rows, "column": column, "reason": reason, "value": value})
+        if self.policy == "strict":
+            raise ValidationError([{"row": self.rows, "column": column, "reason": reason, "value": value}
+                                   for column, reason, value in found])
+
+    # the raw counters, e.g. to be sent from a worker process
+    def counters(self):
+        return {"rows": self.rows, "invalid_rows": self.invalidRows, "errors": self.count,
+                "reported": self.errors}
+
+    # adding of the counters of the next chunk of the input, its rows are
+    # numbered after the ones already counted
+    def merge(self, counters):
+        for error in counters["reported"]:
+            if len(self.errors) >= self.maxErrors:
+                break
+            self.errors.append(dict(error, row = error["row"] + self.rows))
+        self.rows += counters["rows"]
+        self.invalidRows += counters["invalid_rows"]
+        self.count += counters["errors"]
+
+    def report(self):
+        return {"policy": self.policy,
+                "rows": self.rows,
+                "invalid_rows": self.invalidRows,
+                "errors": self.count,
+                "truncated": self.count > len(self.errors),
+                "reported": self.errors}
+
+
+# compact store of the mapped rows kept in memory by Map
+#   the IDs are joined into strings of CHUNK rows with their offsets, the
+#   references and the mapped controls of a row are kept as the numbers of
+#   their distinct sets, every set is a run of control codes in one shared
+#   int array, so a row costs its ID and 16 bytes instead of three lists
+#   and their strings
+#   the rows are rebuilt as [id, [references], [mapped]] when they are read,
+#   changes of the rebuilt lists are not kept
+#
+#   store = RowStore([['CM1', ['CP-13'], ['A.17.1.2']]])
+#   store[0]            -> ['CM1', ['CP-13'], ['A.17.1.2']]
+#   store.nbytes()      -> the bytes of the store
+class RowStore:
+
+    # number of the IDs joined into one string
+    CHUNK = 65536
+
+    # maximal number of the distinct sets of controls looked up again
+    SETS = 65536
+
+    def __init__(self, rows = ()):
+        import array
+        self._chunks = []                       # the joined IDs of CHUNK rows
+        self._pending = []                      # the IDs of the last rows
+        self._tail = None                       # the pending IDs joined
+        self._idOffsets = array.array('q', [0])
+        self._refs = array.array('i')           # row -> set of the references
+        self._mapped = array.array('i')         # row -> set of the mapped controls
+        self._controls = []                     # code -> control
+        self._codes = {}                        # control -> code
+        self._sets = {}                         # tuple of codes -> set, see SETS
+        self._setCodes = array.array('i')       # the codes of all the sets
+        self._setOffsets = array.array('I', [0])
+        self._extras = {}                       # row -> passed through columns, see CsvSchema
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self._refs)
+
+    # adding of a mapped row [id, references, mapped, *kept]
+    def append(self, row):
+        if len(row) > 3:
+            self._extras[len(self._refs)] = tuple(row[3:])
+        id = row[0]
+        self._pending.append(id)
+        self._tail = None
+        if len(self._pending) == self.CHUNK:
+            self._chunks.append("".join(self._pending))
+            self._pending = []
+        self._idOffsets.append(self._idOffsets[-1] + len(id))
+        self._refs.append(self._set(row[1]))
+        self._mapped.append(self._set(row[2]))
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    # number of a set of controls, a new set is added to the shared array
+    #   only the first SETS distinct sets are found again, the other ones
+    #   are added as new
+    def _set(self, controls):
+        codes = self._codes
+        key = tuple(map(codes.get, controls))
+        number = self._sets.get(key)
+        if number is None:
+            if None in key:
+                for control in controls:
+                    if control not in codes:
+                        codes[control] = len(self._controls)
+                        self._controls.append(sys.intern(control))
+                key = tuple(map(codes.__getitem__, controls))
+                number = self._sets.get(key)
+            if number is None:
+                number = len(self._setOffsets) - 1
+                if len(self._sets) < self.SETS:
+                    self._sets[key] = number
+                self._setCodes.extend(key)
+                self._setOffsets.append(len(self._setCodes))
+        return number
+
+    # the controls of a set as a new list
+    def _list(self, number):
+        offsets = self._setOffsets
+        return list(map(self._controls.__getitem__, self._setCodes[offsets[number]:offsets[number + 1]]))
+
+    # the joined IDs of the chunk of a row and the offset of the chunk
+    def _chunk(self, i):
+        n = i // self.CHUNK
+        if n < len(self._chunks):
+            text = self._chunks[n]
+        else:
+            if self._tail is None:
+                self._tail = "".join(self._pending)
+            text = self._tail
+        return text, self._idOffsets[n * self.CHUNK]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("RowStore index out of range")
+        text, base = self._chunk(i)
+        row = [text[self._idOffsets[i] - base:self._idOffsets[i + 1] - base],
+               self._list(self._refs[i]), self._list(self._mapped[i])]
+        if i in self._extras:
+            row.extend(self._extras[i])
+        return row
+
+    def __iter__(self):
+        offsets = self._idOffsets
+        get = self._list
+        refs = self._refs
+        mapped = self._mapped
+        extras = self._extras
+        for start in range(0, len(self), self.CHUNK):
+            text, base = self._chunk(start)
+            for i in range(start, min(start + self.CHUNK, len(self))):
+                row = [text[offsets[i] - base:offsets[i + 1] - base], get(refs[i]), get(mapped[i])]
+                if extras and i in extras:
+                    row.extend(extras[i])
+                yield row
+
+    # the bytes of the rows and the sets, the controls are not counted, they
+    # are shared with the mapping tables
+    def nbytes(self):
+        arrays = (self._idOffsets, self._refs, self._mapped, self._setCodes, self._setOffsets)
+        return (sum(sys.getsizeof(t) for t in self._chunks)
+                + sys.getsizeof(self._pending) + sum(sys.getsizeof(t) for t in self._pending)
+                + sum(a.itemsize * len(a) for a in arrays)
+                + sys.getsizeof(self._sets) + sum(sys.getsizeof(k) for k in self._sets)
+                + sys.getsizeof(self._codes)
+                + sys.getsizeof(self._extras) + sum(sys.getsizeof(e) + sum(map(sys.getsizeof, e))
+                                                    for e in self._extras.values()))
+
+
+# True if two paths are the same file, also through links, a missing file
+# is compared by its real path
+def _sameFile(a, b):
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return os.path.realpath(a) == os.path.realpath(b)
+
+
 # a mapping class
 class Map:
     ## considerin one-to-many separated by ","
-    def __init__(self, in_path, out_path, type):
+    def __init__(self, in_path, out_path, type = None, stream = False, workers = 1, cacheSize = 65536,
+                 source = None, target = None, metrics = None, incremental = None,
+                 generalise = True, validate = None, encoding = "utf-8",
+                 header = None, idColumn = None, refColumn = None, keep = (), schema = None):
         ## map type:
         ##      0 ISO 27001:2022  -> to ->  NIST 800 53 rev 5
         ##      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
+        ## source, target:
+        ##      names of the frameworks of a registered catalogue, used
+        ##      instead of the type, e.g. NIST800_53R5 and ISO27001_2013
+        ## stream:
+        ##      False   the whole CSV is read and mapped here and kept in memory
+        ##      True    nothing is read here, the rows are streamed from the
+        ##              input to the output CSV in save()
+        ## workers:
+        ##      number of processes used by save(), more than 1 implies the
+        ##      streaming mode, the input CSV is split into chunks on row
+        ##      boundaries which are mapped in parallel and written in order
+        ## cacheSize:
+        ##      number of distinct reference cells whose mapping is kept in
+        ##      a LRU cache, 0 disables the cache
+        ## metrics:
+        ##      None    no instrumentation (default)
+        ##      True    the stage times and counters are collected, see metrics()
+        ##      a function or a path, the report is passed to it after save(),
+        ##      see Metrics
+        ## incremental:
+        ##      None    every row is mapped (default)
+        ##      True    the sidecar index of the output (output + ".mapidx")
+        ##              is used, see below
+        ##      a path of the sidecar index
+        ##      only the rows whose reference cell changed since the run
+        ##      which wrote the index are mapped, the other ones are taken
+        ##      from the index, the whole index is ignored if the mapping
+        ##      table changed, the index is rewritten by save(); the rows
+        ##      are mapped in the current process, workers are not used
+        ## generalise:
+        ##      True    the enhancements such as SI-4(14) are replaced by their
+        ##              base control SI-4 in the references (default)
+        ##      False   the references are kept as they are
+        ##      in both cases an enhancement is mapped by its base control,
+        ##      unless it has a finer mapping, see registerOverrides()
+        ## validate:
+        ##      None    no validation (default)
+        ##      "strict", "lenient" or "skip", the rows are validated before
+        ##              the mapping with this policy, see Validator and
+        ##              validation()
+        ##      a Validator
+        ## encoding:
+        ##      of the input CSV, "utf-8" by default, a byte order mark is
+        ##      skipped, see CsvFile
+        ## header, idColumn, refColumn, keep:
+        ##      the columns of the input CSV, by default inferred from its
+        ##      first rows, see inferSchema; a detected header is not mapped
+        ##      and is written as the header of the CSV output, the kept
+        ##      columns are passed through unchanged after the mapped ones
+        ## schema:
+        ##      a CsvSchema used instead of the above, e.g. of another file
+        ## reading and writing errors are raised (OSError), in the strict
+        ## validation also ValidationError, decoding errors as
+        ## UnicodeDecodeError
         self._filePath = in_path
+        self._encoding = encoding
         self._resPath = out_path
+        if source is not None or target is not None:
+            if source is None or target is None:
+                raise ValueError("Both the source and the target framework must be given")
+            type = (source, target)
+        elif type is None:
+            raise ValueError("Either the map type or the source and target frameworks must be given")
         self._mapType = type
+        self._workers = max(int(workers), 1)
+        self._stream = stream or self._workers > 1
+        if incremental is True:
+            incremental = out_path + ".mapidx"
+        self._indexPath = incremental or None
+        if self._indexPath is not None:
+            self._workers = 1
+        self._cacheSize = cacheSize
+        self._cache = CellCache(cacheSize) if cacheSize else None
+        if metrics is None or isinstance(metrics, Metrics):
+            self._metrics = metrics
+        else:
+            self._metrics = Metrics(None if metrics is True else metrics)
 
-        self._NIST_generalisation = True
+        self._NIST_generalisation = generalise
 
         # set the mapping list
-        if self._mapType==0:
-            self._dataMap = ISO13toNIST
+        self._dataMap = mappingList(self._mapType)
+        self._engine = getEngine(self._mapType)
+        self._changeIndex = None
+        self._changes = None
+        if validate is None or isinstance(validate, Validator):
+            self._validator = validate
         else:
-            self._dataMap = NISTtoISO13
-
-        #reading user's csv
-        self._dataUser = self.read_csv(self._filePath)
-
-        #reading user's data
-        self._dataUser = self.cleanBefore(self._dataUser)
+            self._validator = Validator(self._mapType, validate)
+        if schema is None:
+            if in_path is None:
+                schema = CsvSchema()
+            else:
+                schema = inferSchema(in_path, self._mapType, header, idColumn, refColumn, keep, encoding)
+        self._schema = schema
 
+        if self._stream:
+            self._dataUser = None
+            return
 
-        #the mapping process
-        for row in self._dataUser:
-            mapped = []
-            for ref in row[1]:
-                val = self._dataMap.get(ref, ref)
-                #print("\t\t" + str(ref) + " : " + str(val))
-                if ref == val:
-                    continue
-                mapped.append(val)
-            mappedFin = []
-            for m in mapped:
-                mappedFin += m
-            while("" in mappedFin):
-                mappedFin.remove("")
-            if len(mappedFin) == 0:
-                mappedFin.append("None")
-            mappedFin.sort()
-            row.append(mappedFin)
-        self._dataUser = self.cleanAfter(self._dataUser)
+        #reading, cleaning and mapping of user's csv, row by row into
+        #the compact store, see RowStore
+        if self._metrics is None:
+            rows = self.mapRows(self.readRows(self._filePath))
+        else:
+            rows = self.mapRows(self._metrics.stage("read", self.readRows(self._filePath)), "read")
+        self._dataUser = RowStore(rows)
 
 
         # for tetsing purposes
@@ -133,44 +1279,201 @@ class Map:
         #self.print(self._dataUser)
 
 
-    # cleaning function
-    def cleanBefore(self,data):
+    # the rows of the mapping, either the ones kept in memory or, in the
+    # streaming mode, a generator running the whole pipeline
+    #   read -> clean -> generalise -> map (and dedupe)
+    # row by row
+    def rows(self):
+        if not self._stream:
+            return self._dataUser
+        if self._validator is not None:
+            self._validator.reset()
+        if self._metrics is None:
+            return self.mapRows(self.readRows(self._filePath))
+        return self.mapRows(self._metrics.stage("read", self.readRows(self._filePath)), "read")
+
+
+    # cleaning and mapping of the raw CSV rows, one by one
+    #   upstream = the timed stage giving the rows, if the metrics are enabled
+    def mapRows(self, rows, upstream = None):
+        m = self._metrics
+        v = self._validator
+        if v is not None and (self._cache is None or self._indexPath is not None):
+            rows = v.check(rows)
+            v = None
+        if self._indexPath is not None:
+            if m is None:
+                return self._mapChanged(rows)
+            return m.stage("clean_map", m.count(self._mapChanged(rows), self._engine), upstream)
+        if m is None:
+            if self._cache is None:
+                rows = (self.cleanRow(row) for row in rows)
+                return (self.mapRow(row) for row in rows)
+            if v is not None:
+                return v.checkMap(rows, self.cleanMapRowKnown)
+            return (self.cleanMapRow(row) for row in rows)
 
-        lines = len(data)
-        for i in range(lines):
-            for j in range(len(data[i])):
-                data[i][j] = self.clean_cell(str(data[i][j]))
+        if self._cache is None:
+            rows = m.stage("clean", (self.cleanRow(row) for row in rows), upstream)
+            rows = (self.mapRow(row) for row in m.count(rows, self._engine))
+            return m.stage("map", rows, "clean")
+        if v is not None:
+            rows = v.checkMap(rows, self.cleanMapRowKnown)
+        else:
+            rows = (self.cleanMapRow(row) for row in rows)
+        return m.stage("clean_map", m.count(rows, self._engine), upstream)
+
+    # name of the last timed stage of mapRows
+    def _mapStage(self):
+        return "map" if self._cache is None and self._indexPath is None else "clean_map"
+
+
+    # incremental cleaning and mapping of the raw CSV rows
+    #   a row whose reference cell has the same hash as in the sidecar
+    #   index is taken from the index, other rows are mapped, the new index
+    #   is kept for save()
+    def _mapChanged(self, rows):
+        table = mappingDigest(self._mapType, self._dataMap, self._NIST_generalisation,
+                              enhancementOverrides(self._mapType))
+        old = loadChangeIndex(self._indexPath, table)
+        new = {}
+        count = 0
+        reused = 0
+        for row in rows:
+            count += 1
+            key = row[0]
+            digest = cellDigest(row[1])
+            entry = old.get(key)
+            if entry is not None and entry[0] == digest:
+                reused += 1
+                row[0] = self.clean_cell(row[0])
+                row[1:3] = [list(entry[1]), list(entry[2])]
+            else:
+                if self._cache is None:
+                    self.mapRow(self.cleanRow(row))
+                else:
+                    self.cleanMapRow(row)
+                entry = (digest, tuple(row[1]), tuple(row[2]))
+            new[key] = entry
+            yield row
+
+        self._changeIndex = (table, new)
+        self._changes = {"rows": count, "reused": reused, "mapped": count - reused,
+                         "removed": sum(1 for key in old if key not in new)}
+
+
+    # counters of the incremental mapping, None if it is not enabled or
+    # the rows were not mapped yet
+    #   rows = rows of the input, reused = rows taken from the sidecar index,
+    #   mapped = rows new or changed, removed = control IDs in the index but
+    #   not in the input
+    def changeInfo(self):
+        return self._changes
+
+
+    # cleaning and mapping of a single row through the cache, the row is
+    # modified in place as by cleanRow and mapRow
+    def cleanMapRow(self,row):
+        refs, mapped, known = self._cache(self._mapType, self._NIST_generalisation, row[1])
+        row[0] = self.clean_cell(row[0])
+        row[1:3] = [list(refs), list(mapped)]
+        return row
+
+    # as cleanMapRow for the validation, returns None if the row is surely
+    # valid, i.e. all its cleaned references are known controls (the flag
+    # is kept in the cache with the cell) and its ID starts with a letter or
+    # a digit, otherwise the raw (id, references) to be checked in full,
+    # see Validator.checkMap, a row of less than two columns raises IndexError
+    def cleanMapRowKnown(self,row):
+        id, cell = row[0], row[1]
+        refs, mapped, known = self._cache(self._mapType, self._NIST_generalisation, cell)
+        row[0] = self.clean_cell(id)
+        row[1:3] = [list(refs), list(mapped)]
+        if known and id[:1].isalnum():
+            return None
+        return id, cell
+
+
+    # hits, misses and evictions of the cache, None if there is no cache
+    def cacheInfo(self):
+        if self._cache is None:
+            return None
+        return self._cache.info()
 
-        for i in range(lines):
-            data[i][1] = data[i][1].split(',')
 
+    # coverage of the controls of the target framework by the mapped rows,
+    # see Coverage
+    #   in memory the kept rows are counted, in the streaming mode the input
+    #   is mapped once more without writing, in parallel by the workers
+    def coverage(self, overCovered = 3):
+        coverage = Coverage(self._mapType, overCovered)
+        if self._workers > 1:
+            for counters in self.mapParallel("coverage"):
+                coverage.merge(counters)
+            return coverage
+        return coverage.addRows(self.rows())
 
 
-        if self._NIST_generalisation:
-            for i in range(len(data)):
-                for j in range(len(data[i][1])):
-                    #print(data[i][1][j], re.sub(r"\([0-9]+\)","",data[i][1][j]))
-                    data[i][1][j] = re.sub(r"\([0-9]+\)","",data[i][1][j])
-                    # remove potential duplicates
-                data[i][1] = list(dict.fromkeys(data[i][1]))
+    # the report of the validation, None if the validation is not enabled,
+    # see Validator
+    def validation(self):
+        if self._validator is None:
+            return None
+        return self._validator.report()
 
+
+    # the report of the metrics, None if the metrics are not enabled
+    def metrics(self):
+        if self._metrics is None:
+            return None
+        return self._metrics.report()
+
+
+    # cleaning function
+    def cleanBefore(self,data):
+        for row in data:
+            self.cleanRow(row)
         return data
-    
+
+
+    # cleaning of a single row, the row is modified in place
+    #   only the first two columns are used, the other ones are replaced
+    #   by the mapped controls
+    def cleanRow(self,row):
+        row[0] = self.clean_cell(row[0])
+        row[1] = self._engine.tokenize(row[1], self._NIST_generalisation)
+        return row
+
+
+    # mapping of a single cleaned row, the mapped controls are stored
+    # as the third column of the row, already sorted and without duplicates
+    def mapRow(self,row):
+        row[2:3] = [list(self._engine.mapRow(row[1]))]
+        return row
+
 
     # cleaning function
+    #   not needed after mapRow any more, the engine returns the mapped
+    #   controls deduplicated and without 'None', kept for the older code
     def cleanAfter(self,data):
         for row in data:
-            #print(row)
-            #delete duplicates
-            row[2] = list(dict.fromkeys(row[2]))
+            self.cleanAfterRow(row)
+        return data
 
-            # delete 'None' if other elements are present
-            if len(row[2]) > 1 and 'None' in row[2]:
-                row[2].remove('None')
-                #for i in len(row[2]):
-                #    if row[2][i] == 'None':
 
-        return data
+    # cleaning of a single mapped row, the row is modified in place
+    def cleanAfterRow(self,row):
+        #print(row)
+        #delete duplicates
+        row[2] = list(dict.fromkeys(row[2]))
+
+        # delete 'None' if other elements are present
+        if len(row[2]) > 1 and 'None' in row[2]:
+            row[2].remove('None')
+            #for i in len(row[2]):
+            #    if row[2][i] == 'None':
+
+        return row
     
 
     
@@ -178,12 +1481,13 @@ class Map:
         #s = s.replace("(", "_")
         #s = s.replace(")", "_")
         #s = re.sub(r"[^\w\s]", '', s)
-        s = re.sub(r"\s+", '', s)
+        #s = re.sub(r"\s+", '', s)
+        s = "".join(s.split())
         return s
 
     def print(self, data = None):
         if data is None:
-            data = self._dataUser 
+            data = self.rows()
         for record in data:
             for i in range(len(record)):
                 if i>0:
@@ -191,509 +1495,1888 @@ class Map:
                 else:
                     print(record[i])
                 
-    # save output to the CSV format
-    def save(self):
+    # save output to the CSV (or other) format
+    #   the errors of writing are raised, e.g. PermissionError
+    #   compression = None (by the suffix of the output, ".gz" or ".zst"),
+    #                 "gzip", "zstd" or "none", for Parquet the compression
+    #                 of its pages, for Arrow only "zstd" (or "none")
+    #   format = None (by the suffix of the output, see outputFormat),
+    #            "csv", "jsonl", "arrow" or "parquet"
+    #   in the streaming mode (and in parallel) the input is read while the
+    #   output is written, so an output which is the input raises ValueError
+    #   instead of truncating it, in memory a file can be mapped in place
+    def save(self, compression = None, format = None):
+        if self._stream and self._filePath is not None and _sameFile(self._filePath, self._resPath):
+            raise ValueError(f"The output '{self._resPath}' is the input, which is read while the output "
+                             "is written in the streaming mode")
+        if format is None:
+            format = outputFormat(self._resPath)
+        if format in ("arrow", "parquet"):
+            self._write(lambda rows: self.writeRowsColumnar(self._resPath, rows, format, compression), format)
+        elif format in ("csv", "jsonl"):
+            with openOutput(self._resPath, compression) as f:
+                if format == "csv" and self._schema.header is not None:
+                    csv.writer(f).writerow(self.header())
+                writeRows = self.writeRows if format == "csv" else self.writeRowsJsonl
+                self._write(lambda rows: writeRows(f, rows), format, f)
+        else:
+            raise ValueError(f"Unknown format '{format}'")
+
+        if self._changeIndex is not None:
+            saveChangeIndex(self._indexPath, *self._changeIndex)
+
+        if self._metrics is not None:
+            source, target = mapDirection(self._mapType)
+            self._metrics.finish(map = source + " -> " + target,
+                                 mode = "parallel" if self._workers > 1 else "stream" if self._stream else "memory",
+                                 workers = self._workers,
+                                 format = format,
+                                 cache = self.cacheInfo() if self._workers == 1 else None,
+                                 changes = self._changes,
+                                 validation = self.validation())
+
+    # writing of all the mapped rows by a function of the format
+    #   in parallel the chunks of the text formats are written to the opened
+    #   file f as they come from the workers, the rows of the columnar
+    #   formats are passed to the function
+    def _write(self, write, format, f = None):
+        if self._workers > 1:
+            chunks = self.mapParallel(format)
+            if f is None:
+                write(row for rows in chunks for row in rows)
+            else:
+                for text in chunks:
+                    f.write(text)
+        elif self._metrics is None:
+            write(self.rows())
+        else:
+            upstream = self._mapStage() if self._stream else None
+            self._metrics.block("write", write, self.rows(), upstream = upstream)
+
+    # the header of the CSV output, the name of the ID column of the input,
+    # the target framework and the names of the kept columns
+    #   schema = of the input, the one of the Map by default
+    def header(self, schema = None):
+        schema = schema or self._schema
+        id = "ID" if schema.header is None or schema.idColumn >= len(schema.header) else schema.header[schema.idColumn]
+        return [id, mapDirection(self._mapType)[1]] + schema.keepNames()
+
+    # writing the mapped rows to an opened file in the CSV format,
+    # returns the number of the written rows
+    #   the rows are written in batches by writerows, the mapped controls
+    #   of a row are joined to a single cell by ", ", the kept columns
+    #   follow them
+    #   schema = of the input, the one of the Map by default
+    def writeRows(self, f, rows, schema = None):
+        writer = csv.writer(f)
+        join = ", ".join
+        rows = iter(rows)
+        count = 0
+        keep = bool((schema or self._schema).keep)
+        while True:
+            if keep:
+                batch = [(row[0], join(row[2]), *row[3:]) for row in islice(rows, _WRITE_BATCH)]
+            else:
+                batch = [(row[0], join(row[2])) for row in islice(rows, _WRITE_BATCH)]
+            if not batch:
+                return count
+            writer.writerows(batch)
+            count += len(batch)
+
+    # writing the mapped rows to an opened file in the JSON Lines format,
+    # one object per row, returns the number of the written rows
+    #   the kept columns are added by their names, see CsvSchema.keepNames
+    def writeRowsJsonl(self, f, rows):
+        import json
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        rows = iter(rows)
+        count = 0
+        names = self._schema.keepNames()
+        while True:
+            if names:
+                batch = [dumps({"id": row[0], "references": row[1], "mapped": row[2],
+                                **dict(zip(names, row[3:]))}) + "\n"
+                         for row in islice(rows, _WRITE_BATCH)]
+            else:
+                batch = [dumps({"id": row[0], "references": row[1], "mapped": row[2]}) + "\n"
+                         for row in islice(rows, _WRITE_BATCH)]
+            if not batch:
+                return count
+            f.write("".join(batch))
+            count += len(batch)
+
+    # writing the mapped rows to a file in the Arrow IPC or Parquet format,
+    # returns the number of the written rows
+    #   the columns are id (string), references and mapped (list<string>)
+    #   and the kept columns (string), the rows are converted and written
+    #   in record batches of _RECORD_BATCH rows, so only one batch is in
+    #   the memory at once
+    def writeRowsColumnar(self, path, rows, format = "parquet", compression = None):
+        pa = _pyarrow()
+        strings = pa.list_(pa.string())
+        names = self._schema.keepNames()
+        schema = pa.schema([("id", pa.string()), ("references", strings), ("mapped", strings)]
+                           + [(name, pa.string()) for name in names])
+        if compression == "none":
+            compression = None
+
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            options = {} if compression is None else {"compression": compression}
+            writer = pq.ParquetWriter(path, schema, **options)
+            writeBatch = lambda batch: writer.write_table(pa.Table.from_batches([batch]))
+        elif compression in (None, "zstd"):
+            writer = pa.ipc.new_file(path, schema, options=pa.ipc.IpcWriteOptions(compression=compression))
+            writeBatch = writer.write_batch
+        else:
+            raise ValueError(f"Unknown compression '{compression}' of the Arrow format")
+
+        rows = iter(rows)
+        count = 0
         try:
-            with open(self._resPath, 'w') as f:
-                writer = csv.writer(f)
-                for row in self._dataUser:
-                    lowstr = ""
-                    for i in range(len(row[2])):
-                        if i > 0:
-                            lowstr += ", " + row[2][i]
-                        else:
-                            lowstr += row[2][i]
-                    rowstr = [row[0], lowstr]
-                    #print(rowstr)
-                    writer.writerow(rowstr)
-                
-        except PermissionError:
-            print(f"Error: Permission denied to write the file '{self._resPath}'.")
-        except Exception as e:
-            print(f"Error: An unexpected error occurred: {e}")
+            while True:
+                batch = list(islice(rows, _RECORD_BATCH))
+                if not batch:
+                    return count
+                writeBatch(pa.record_batch([pa.array([row[0] for row in batch], pa.string()),
+                                            pa.array([row[1] for row in batch], strings),
+                                            pa.array([row[2] for row in batch], strings)]
+                                           + [pa.array([row[i] if i < len(row) else None for row in batch], pa.string())
+                                              for i in range(3, 3 + len(names))],
+                                           schema=schema))
+                count += len(batch)
+        finally:
+            writer.close()
+
+    # parallel mapping, yields the mapped chunks in the original order
+    #   the input CSV is split into chunks on row boundaries, every worker
+    #   process compiles the mapping once and maps whole chunks, only a
+    #   limited number of the mapped chunks is waiting in the memory at once
+    #   format = "csv" or "jsonl" chunks are texts, "coverage" counters of
+    #            Coverage, otherwise lists of rows
+    def mapParallel(self, format = "csv"):
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = splitCsv(self._filePath, self._workers * 4, self._encoding, self._schema.start)
+        with ProcessPoolExecutor(self._workers, initializer=_initWorker,
+                                 initargs=(self._mapType, dict(self._dataMap), enhancementOverrides(self._mapType),
+                                           self._NIST_generalisation, self._encoding, self._schema,
+                                           self._cacheSize, self._metrics is not None,
+                                           None if self._validator is None else
+                                           (self._validator.policy, self._validator.maxErrors))) as pool:
+            if self._validator is not None:
+                self._validator.reset()
+            pending = deque()
+            for start, end in chunks:
+                if len(pending) >= self._workers * 2:
+                    yield self._mergeChunk(pending.popleft())
+                pending.append(pool.submit(_mapChunk, self._filePath, start, end, format))
+            while pending:
+                yield self._mergeChunk(pending.popleft())
+
+    # parallel mapping to an opened file in the CSV format
+    def saveParallel(self, f):
+        for text in self.mapParallel("csv"):
+            f.write(text)
+
+    # a chunk mapped by a worker, the metrics and the validation of the
+    # worker are merged, the rows of its validation errors are numbered
+    # after the rows of the previous chunks
+    def _mergeChunk(self, future):
+        try:
+            data, counters, validation = future.result()
+        except ValidationError as e:
+            e.shift(self._validator.rows)
+            raise
+        if counters is not None:
+            self._metrics.merge(counters)
+        if validation is not None:
+            self._validator.merge(validation)
+        return data
 
     # reading CSV format
+    #   the errors are raised, e.g. FileNotFoundError or PermissionError
     def read_csv(self,file_path):
-        try:
-            with open(file_path, 'r') as f:
-                reader = csv.reader(f)
-                data = list(reader)
-                
-            return data
-
-        except FileNotFoundError:
-            print(f"Error: The file '{file_path}' does not exist.")
-        except PermissionError:
-            print(f"Error: Permission denied to read the file '{file_path}'.")
-        except Exception as e:
-            print(f"Error: An unexpected error occurred: {e}")
-
-
-NISTtoISO13 = {
-'AC-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.9.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'AC-2':['A.9.2.1','A.9.2.2','A.9.2.3','A.9.2.5','A.9.2.6'],
-'AC-3':['A.6.2.2','A.9.1.2','A.9.4.1','A.9.4.4','A.9.4.5','A.13.1.1','A.14.1.2','A.14.1.3','A.18.1.3'],
-'AC-4':['A.13.1.3','A.13.2.1','A.14.1.2','A.14.1.3'],
-'AC-5':['A.6.1.2'],
-'AC-6':['A.9.1.2','A.9.2.3','A.9.4.4','A.9.4.5'],
-'AC-7':['A.9.4.2'],
-'AC-8':['A.9.4.2'],
-'AC-9':['A.9.4.2'],
-'AC-10':['None'],
-'AC-11':['A.11.2.8','A.11.2.9'],
-'AC-12':['None'],
-'AC-13':['Withdrawed from 800 53 rev5'],
-'AC-14':['None'],
-'AC-15':['Withdrawed from 800 53 rev5'],
-'AC-16':['None'],
-'AC-17':['A.6.2.1','A.6.2.2','A.13.1.1','A.13.2.1','A.14.1.2'],
-'AC-18':['A.6.2.1','A.13.1.1','A.13.2.1'],
-'AC-19':['A.6.2.1','A.11.1.5','A.11.2.6','A.13.2.1'],
-'AC-20':['A.11.2.6','A.13.1.1','A.13.2.1'],
-'AC-21':['None'],
-'AC-22':['None'],
-'AC-23':['None'],
-'AC-24':['A.9.4.1'],
-'AC-25':['None'],
-'AT-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'AT-2':['7.3','A.7.2.2','A.12.2.1'],
-'AT-3':['A.7.2.2'],
-'AT-4':['None'],
-'AT-5':['Withdrawed from 800 53 rev5'],
-'AT-6':['None'],
-'AU-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'AU-2':['None'],
-'AU-3':['A.12.4.1'],
-'AU-4':['A.12.1.3'],
-'AU-5':['None'],
-'AU-6':['A.12.4.1','A.16.1.2','A.16.1.4'],
-'AU-7':['None'],
-'AU-8':['A.12.4.4'],
-'AU-9':['A.12.4.2','A.12.4.3','A.18.1.3'],
-'AU-10':['None'],
-'AU-11':['A.12.4.1','A.16.1.7'],
-'AU-12':['A.12.4.1','A.12.4.3'],
-'AU-13':['None'],
-'AU-14':['A.12.4.1'],
-'AU-15':['Withdrawed from 800 53 rev5'],
-'AU-16':['None'],
-'CA-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'CA-2':['A.14.2.8','A.18.2.2','A.18.2.3'],
-'CA-3':['A.13.1.2','A.13.2.1','A.13.2.2'],
-'CA-4':['Withdrawed from 800 53 rev5'],
-'CA-5':['8.3','9.2','10.1'],
-'CA-6':['9.3'],
-'CA-7':['9.1','9.2','A.18.2.2','A.18.2.3'],
-'CA-8':['None'],
-'CA-9':['None'],
-'CM-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'CM-2':['None'],
-'CM-3':['8.1','A.12.1.2','A.14.2.2','A.14.2.3','A.14.2.4'],
-'CM-4':['A.14.2.3'],
-'CM-5':['A.9.2.3','A.9.4.5','A.12.1.2','A.12.1.4','A.12.5.1'],
-'CM-6':['None'],
-'CM-7':['A.12.5.1'],
-'CM-8':['A.8.1.1','A.8.1.2'],
-'CM-9':['A.6.1.1'],
-'CM-10':['A.18.1.2'],
-'CM-11':['A.12.5.1','A.12.6.2'],
-'CM-12':['None'],
-'CM-13':['None'],
-'CM-14':['None'],
-'CP-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'CP-2':['7.5.1','7.5.2','7.5.3','A.6.1.1','A.17.1.1','A.17.2.1'],
-'CP-3':['A.7.2.2'],
-'CP-4':['A.17.1.3'],
-'CP-5':['Withdrawed from 800 53 rev5'],
-'CP-6':['A.11.1.4','A.17.1.2','A.17.2.1'],
-'CP-7':['A.11.1.4','A.17.1.2','A.17.2.1'],
-'CP-8':['A.11.2.2','A.17.1.2'],
-'CP-9':['A.12.3.1','A.17.1.2','A.18.1.3'],
-'CP-10':['A.17.1.2'],
-'CP-11':['A.17.1.2'],
-'CP-12':['None'],
-'CP-13':['A.17.1.2'],
-'IA-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'IA-2':['A.9.2.1'],
-'IA-3':['None'],
-'IA-4':['A.9.2.1'],
-'IA-5':['A.9.2.1','A.9.2.4','A.9.3.1','A.9.4.3'],
-'IA-6':['A.9.4.2'],
-'IA-7':['A.18.1.5'],
-'IA-8':['A.9.2.1'],
-'IA-9':['None'],
-'IA-10':['None'],
-'IA-11':['None'],
-'IA-12':['None'],
-'IR-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'IR-2':['A.7.2.2'],
-'IR-3':['None'],
-'IR-4':['A.16.1.4','A.16.1.5','A.16.1.6'],
-'IR-5':['None'],
-'IR-6':['A.6.1.3','A.16.1.2'],
-'IR-7':['None'],
-'IR-8':['7.5.1','7.5.2','7.5.3','A.16.1.1'],
-'IR-9':['None'],
-'IR-10':['Withdrawed from 800 53 rev5'],
-'MA-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'MA-2':['A.11.2.4','A.11.2.5'],
-'MA-3':['None'],
-'MA-4':['None'],
-'MA-5':['None'],
-'MA-6':['A.11.2.4'],
-'MA-7':['None'],
-'MP-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'MP-2':['A.8.2.3','A.8.3.1','A.11.2.9'],
-'MP-3':['A.8.2.2'],
-'MP-4':['A.8.2.3','A.8.3.1','A.11.2.9'],
-'MP-5':['A.8.2.3','A.8.3.1','A.8.3.3','A.11.2.5','A.11.2.6'],
-'MP-6':['A.8.2.3','A.8.3.1','A.8.3.2','A.11.2.7'],
-'MP-7':['A.8.2.3','A.8.3.1'],
-'MP-8':['None'],
-'PE-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'PE-2':['A.11.1.2'],
-'PE-3':['A.11.1.1','A.11.1.2','A.11.1.3'],
-'PE-4':['A.11.1.2','A.11.2.3'],
-'PE-5':['A.11.1.2','A.11.1.3'],
-'PE-6':['None'],
-'PE-7':['Withdrawed from 800 53 rev5'],
-'PE-8':['None'],
-'PE-9':['A.11.1.4','A.11.2.1','A.11.2.2','A.11.2.3'],
-'PE-10':['A.11.2.2'],
-'PE-11':['A.11.2.2'],
-'PE-12':['A.11.2.2'],
-'PE-13':['A.11.1.4','A.11.2.1'],
-'PE-14':['A.11.1.4','A.11.2.1','A.11.2.2'],
-'PE-15':['A.11.1.4','A.11.2.1','A.11.2.2'],
-'PE-16':['A.8.2.3','A.11.1.6','A.11.2.5'],
-'PE-17':['A.6.2.2','A.11.2.6','A.13.2.1'],
-'PE-18':['A.8.2.3','A.11.1.4','A.11.2.1'],
-'PE-19':['A.11.1.4','A.11.2.1'],
-'PE-20':['A.8.2.3'],
-'PE-21':['None'],
-'PE-22':['A.8.2.2'],
-'PE-23':['A.11.1.4','A.11.2.1'],
-'PL-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'PL-2':['7.5.1','7.5.2','7.5.3','10.1','A.14.1.1'],
-'PL-3':['Withdrawed from 800 53 rev5'],
-'PL-4':['A.7.1.2','A.7.2.1','A.8.1.3'],
-'PL-5':['Withdrawed from 800 53 rev5'],
-'PL-6':['Withdrawed from 800 53 rev5'],
-'PL-7':['8.1','A.14.1.1'],
-'PL-8':['A.14.1.1'],
-'PL-9':['None'],
-'PL-10':['None'],
-'PL-11':['None'],
-'PM-1':['4.1','4.2','4.3','4.4','5.2','5.3','6.1.1','6.2','7.4','7.5.1','7.5.2','7.5.3','8.1','9.3','10.2','A.5.1.1','A.5.1.2','A.6.1.1','A.18.1.1','A.18.2.2'],
-'PM-2':['5.1','5.3','A.6.1.1'],
-'PM-3':['5.1','6.2','7.1'],
-'PM-4':['6.1.1','6.2','7.5.1','7.5.2','7.5.3','8.3','9.2','9.3','10.1'],
-'PM-5':['None'],
-'PM-6':['5.3','6.1.1','6.2','9.1'],
-'PM-7':['None'],
-'PM-8':['None'],
-'PM-9':['4.3','4.4','6.1.1','6.1.2','6.2','7.5.1','7.5.2','7.5.3','9.3','10.2'],
-'PM-10':['9.3','A.6.1.1'],
-'PM-11':['4.1'],
-'PM-12':['None'],
-'PM-13':['7.2','A.7.2.2'],
-'PM-14':['6.2'],
-'PM-15':['7.4','A.6.1.4'],
-'PM-16':['None'],
-'PM-17':['None'],
-'PM-18':['None'],
-'PM-19':['None'],
-'PM-20':['None'],
-'PM-21':['None'],
-'PM-22':['None'],
-'PM-23':['None'],
-'PM-24':['None'],
-'PM-25':['None'],
-'PM-26':['None'],
-'PM-27':['None'],
-'PM-28':['4.3','6.1.2','6.2','7.4','7.5.1','7.5.2','7.5.3'],
-'PM-29':['5.1','5.3','9.2','A.6.1.1'],
-'PM-30':['4.4','6.2','7.5.1','7.5.2','7.5.3','10.2'],
-'PM-31':['4.4','6.2','7.4','7.5.1','7.5.2','7.5.3','9.1','10.1','10.2'],
-'PM-32':['None'],
-'PS-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'PS-2':['None'],
-'PS-3':['A.7.1.1'],
-'PS-4':['A.7.3.1','A.8.1.4'],
-'PS-5':['A.7.3.1','A.8.1.4'],
-'PS-6':['A.7.1.2','A.7.2.1','A.13.2.4'],
-'PS-7':['A.6.1.1','A.7.2.1'],
-'PS-8':['7.3','A.7.2.3'],
-'PS-9':['A.6.1.1'],
-'PT-1':['None'],
-'PT-2':['None'],
-'PT-3':['None'],
-'PT-4':['None'],
-'PT-5':['None'],
-'PT-6':['None'],
-'PT-7':['None'],
-'PT-8':['None'],
-'RA-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'RA-2':['A.8.2.1'],
-'RA-3':['6.1.2','8.2','A.12.6.1'],
-'RA-4':['Withdrawed from 800 53 rev5'],
-'RA-5':['A.12.6.1'],
-'RA-6':['None'],
-'RA-7':['6.1.3','8.3','10.1'],
-'RA-8':['None'],
-'RA-9':['A.15.2.2'],
-'RA-10':['None'],
-'SA-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','8.1','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'SA-2':['None'],
-'SA-3':['A.6.1.1','A.6.1.5','A.14.1.1','A.14.2.1','A.14.2.6'],
-'SA-4':['8.1','A.14.1.1','A.14.2.7','A.14.2.9','A.15.1.2'],
-'SA-5':['7.5.1','7.5.2','7.5.3','A.12.1.1'],
-'SA-6':['Withdrawed from 800 53 rev5'],
-'SA-7':['Withdrawed from 800 53 rev5'],
-'SA-8':['A.14.2.5'],
-'SA-9':['A.6.1.1','A.6.1.5','A.7.2.1','A.13.1.2','A.13.2.2','A.15.2.1','A.15.2.2'],
-'SA-10':['A.12.1.2','A.14.2.2','A.14.2.4','A.14.2.7'],
-'SA-11':['A.14.2.7','A.14.2.8'],
-'SA-12':['Withdrawed from 800 53 rev5'],
-'SA-13':['Withdrawed from 800 53 rev5'],
-'SA-14':['Withdrawed from 800 53 rev5'],
-'SA-15':['A.6.1.5','A.14.2.1'],
-'SA-16':['None'],
-'SA-17':['A.14.2.1','A.14.2.5'],
-'SA-18':['Withdrawed from 800 53 rev5'],
-'SA-19':['Withdrawed from 800 53 rev5'],
-'SA-20':['None'],
-'SA-21':['A.7.1.1'],
-'SA-22':['None'],
-'SA-23':['None'],
-'SC-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'SC-2':['None'],
-'SC-3':['None'],
-'SC-4':['None'],
-'SC-5':['None'],
-'SC-6':['None'],
-'SC-7':['A.13.1.1','A.13.1.3','A.13.2.1','A.14.1.3'],
-'SC-8':['A.8.2.3','A.13.1.1','A.13.2.1','A.13.2.3','A.14.1.2','A.14.1.3'],
-'SC-9':['Withdrawed from 800 53 rev5'],
-'SC-10':['A.13.1.1'],
-'SC-11':['None'],
-'SC-12':['A.10.1.2'],
-'SC-13':['A.10.1.1','A.14.1.2','A.14.1.3','A.18.1.5'],
-'SC-14':['Withdrawed from 800 53 rev5'],
-'SC-15':['A.13.2.1'],
-'SC-16':['None'],
-'SC-17':['A.10.1.2'],
-'SC-18':['None'],
-'SC-19':['None'],
-'SC-20':['None'],
-'SC-21':['None'],
-'SC-22':['None'],
-'SC-23':['None'],
-'SC-24':['None'],
-'SC-25':['None'],
-'SC-26':['None'],
-'SC-27':['None'],
-'SC-28':['A.8.2.3'],
-'SC-29':['None'],
-'SC-30':['None'],
-'SC-31':['None'],
-'SC-32':['None'],
-'SC-33':['Withdrawed from 800 53 rev5'],
-'SC-34':['None'],
-'SC-35':['None'],
-'SC-36':['None'],
-'SC-37':['None'],
-'SC-38':['A.12.1.1','A.12.1.2','A.12.1.3','A.12.1.4','A.12.2.1','A.12.3.1','A.12.4.1','A.12.4.2','A.12.4.3','A.12.4.4','A.12.5.1','A.12.6.1','A.12.6.2','A.12.7.1'],
-'SC-39':['None'],
-'SC-40':['None'],
-'SC-41':['None'],
-'SC-42':['A.11.1.5'],
-'SC-43':['None'],
-'SC-44':['None'],
-'SC-45':['None'],
-'SC-46':['None'],
-'SC-47':['None'],
-'SC-48':['None'],
-'SC-49':['None'],
-'SC-50':['None'],
-'SC-51':['None'],
-'SI-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2'],
-'SI-2':['A.12.6.1','A.14.2.2','A.14.2.3','A.16.1.3'],
-'SI-3':['A.12.2.1'],
-'SI-4':['None'],
-'SI-5':['A.6.1.4'],
-'SI-6':['None'],
-'SI-7':['None'],
-'SI-8':['None'],
-'SI-9':['Withdrawed from 800 53 rev5'],
-'SI-10':['None'],
-'SI-11':['None'],
-'SI-12':['None'],
-'SI-13':['None'],
-'SI-14':['None'],
-'SI-15':['None'],
-'SI-16':['None'],
-'SI-17':['None'],
-'SI-18':['None'],
-'SI-19':['None'],
-'SI-20':['None'],
-'SI-21':['None'],
-'SI-22':['None'],
-'SI-23':['None'],
-'SR-1':['5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.15.1.1','A.18.1.1','A.18.2.2'],
-'SR-2':['A.14.2.7'],
-'SR-3':['A.15.1.2','A.15.1.3'],
-'SR-4':['A.14.2.7'],
-'SR-5':['A.15.1.3'],
-'SR-6':['A.15.2.1'],
-'SR-7':['A.15.2.2'],
-'SR-8':['None'],
-'SR-9':['None'],
-'SR-10':['None'],
-'SR-11':['None'],
-'SR-12':['None']
+        return list(self.readRows(file_path))
+
+    # reading CSV format row by row from the memory-mapped file, see
+    # CsvFile, the file is kept open only while the rows are consumed
+    #   a header is skipped and the columns are selected, see CsvSchema
+    def readRows(self,file_path):
+        with CsvFile(file_path, self._encoding) as f:
+            yield from self._schema.project(csv.reader(f.lines(self._schema.start)))
+
+# memory-mapped input CSV
+#   the file is mapped instead of read, a UTF-8 byte order mark is skipped
+#   and the text is decoded by the given encoding block by block, every
+#   block is decoded straight from a zero-copy slice (memoryview) of the
+#   mapping and ends on a new line, so no character is cut, a cell quoted
+#   over more lines continues in the next block as csv.reader takes the
+#   lines one by one
+#   the encoding must keep the new lines and the quotes single bytes as
+#   ASCII does, e.g. UTF-8, Latin-1 or cp1252
+#
+#   with CsvFile("in.csv") as f:
+#       rows = csv.reader(f.lines())        -> ['CM0082', 'SC-26,SC-30'], ...
+#       f.split(4)                          -> [(3, 1030), (1030, 2061), ...]
+class CsvFile:
+
+    # size of the decoded blocks
+    BLOCK = 1 << 20
+
+    def __init__(self, path, encoding = "utf-8"):
+        if "\n\r\"".encode(encoding) != b"\n\r\"":
+            raise ValueError(f"The encoding '{encoding}' of the CSV is not ASCII compatible")
+        self.path = path
+        self.encoding = encoding
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        if self.size:
+            import mmap
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # an empty file cannot be mapped
+            self._map = b""
+        self._view = memoryview(self._map)
+        # the first byte of the rows
+        self.start = 3 if self._map[:3] == b"\xef\xbb\xbf" else 0
+
+    def close(self):
+        self._view.release()
+        if self.size:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # the (start, end) byte ranges of about BLOCK bytes ending on a new line
+    def blocks(self, start = 0, end = None):
+        start = max(start, self.start)
+        end = self.size if end is None else min(end, self.size)
+        while start < end:
+            stop = start + self.BLOCK
+            if stop < end:
+                nl = self._map.rfind(b'\n', start, stop)
+                if nl < 0:
+                    nl = self._map.find(b'\n', stop, end)
+                stop = end if nl < 0 else nl + 1
+            else:
+                stop = end
+            yield start, stop
+            start = stop
+
+    # the decoded lines of a byte range, the line ends are kept for
+    # csv.reader, as by open(newline='')
+    def lines(self, start = 0, end = None):
+        view = self._view
+        encoding = self.encoding
+        for a, b in self.blocks(start, end):
+            yield from io.StringIO(str(view[a:b], encoding), newline='')
+
+    # the offset after the row starting at the offset start, a new line
+    # inside a quoted cell does not end the row
+    def rowEnd(self, start):
+        quotes = 0
+        scan = start
+        while True:
+            nl = self._map.find(b'\n', scan)
+            if nl < 0:
+                return self.size
+            quotes += self._map[scan:nl].count(b'"')
+            if quotes % 2 == 0:
+                return nl + 1
+            scan = nl + 1
+
+    # splitting of the rows into about the given number of byte ranges
+    #   every range starts and ends on a row boundary, a new line inside
+    #   a quoted cell is not a boundary (the number of quotes before a
+    #   boundary is even), returns a list of (start, end) offsets
+    #   start = offset of the first row, e.g. after the header
+    def split(self, parts, start = 0):
+        size = self.size
+        start = max(start, self.start)
+        step = max((size - start) // max(parts, 1), 1)
+        bounds = [start]
+        target = start + step
+        quotes = 0
+        for offset, blockEnd in self.blocks(start):
+            if target >= size:
+                break
+            block = self._map[offset:blockEnd]
+            i = max(target - offset, 0)
+            while i < len(block) and target < size:
+                nl = block.find(b'\n', i)
+                if nl < 0:
+                    break
+                if (quotes + block.count(b'"', 0, nl)) % 2 == 0:
+                    bounds.append(offset + nl + 1)
+                    target = max(target + step, bounds[-1])
+                    i = target - offset
+                else:
+                    i = nl + 1
+            quotes += block.count(b'"')
+        if bounds[-1] < size:
+            bounds.append(size)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+
+# splitting of a CSV file into about the given number of byte ranges on
+# row boundaries, see CsvFile.split
+def splitCsv(path, parts, encoding = "utf-8", start = 0):
+    with CsvFile(path, encoding) as f:
+        return f.split(parts, start)
+
+
+# the columns of an input CSV, see inferSchema
+#   header = the names of the columns, None if the CSV has no header
+#   idColumn, refColumn = indexes of the control IDs and of the references
+#   keep = indexes of the columns passed through to the output
+#   start = byte offset of the first row of the data, i.e. after the header
+#   width = number of the columns seen by inferSchema
+class CsvSchema:
+    def __init__(self, header = None, idColumn = 0, refColumn = 1, keep = (), start = 0, width = 2):
+        self.header = header
+        self.idColumn = idColumn
+        self.refColumn = refColumn
+        self.keep = tuple(keep)
+        self.start = start
+        self.width = width
+
+    # names of the passed through columns, "column N" without a header
+    def keepNames(self):
+        if self.header is None:
+            return ["column " + str(i) for i in self.keep]
+        return [self.header[i] if i < len(self.header) else "column " + str(i) for i in self.keep]
+
+    # the parsed rows cut to [id, references] or, with passed through
+    # columns, [id, references, references, *kept], the third column is
+    # the place of the mapped controls, the other columns are dropped
+    # right after the parsing by a single itemgetter
+    #   rows of just the ID and the references are returned as they are
+    def project(self, rows):
+        if self.idColumn == 0 and self.refColumn == 1 and not self.keep and self.width <= 2:
+            return rows
+        return self._project(rows)
+
+    def _project(self, rows):
+        columns = (self.idColumn, self.refColumn)
+        if self.keep:
+            columns += (self.refColumn,) + self.keep
+        get = itemgetter(*columns)
+        width = max(columns) + 1
+        for row in rows:
+            if len(row) < width:
+                if not row:
+                    yield row
+                    continue
+                row = row + [""] * (width - len(row))
+            yield list(get(row))
+
+
+# number of the rows read by inferSchema
+_SCHEMA_SAMPLE = 1000
+
+# the shape of a cell, its runs of letters and digits, e.g. CM0082 -> a9
+_SHAPE = (re.compile(r"[0-9]+"), re.compile(r"[A-Za-z]+"))
+
+def _shape(cell):
+    return _SHAPE[1].sub("a", _SHAPE[0].sub("9", cell.strip()))
+
+# a header name of a column of IDs, e.g. ID, Control ID or control_id
+_ID_NAME = re.compile(r"(.*[\s_\-])?(id|identifier)", re.IGNORECASE).fullmatch
+
+# inference of the columns of an input CSV from its first rows
+#   header = True/False, or None to detect it, the first row is a header
+#            only on a positive signal: its reference cell is a non-empty
+#            text without any reference (the syntax of the controls of the
+#            source framework, see CONTROL_SYNTAX), none of its cells has a
+#            reference, its ID has another shape than all the other IDs
+#            (e.g. "ID" and CM0082) and at least half of the other rows have
+#            references in the reference column; an empty or unknown first
+#            reference such as "CM1,N/A" is data
+#   idColumn, refColumn = index or name (needs the header) of the column,
+#            None infers the references as the column 1 if some of its
+#            cells look like references, otherwise as the column where most
+#            of them do, the IDs as the column 0 (or 1 if 0 are the
+#            references) unless a header names another column as IDs, e.g.
+#            "Control ID", the IDs may repeat
+#   keep = indexes or names of the columns passed through to the output
+#   returns a CsvSchema, an unknown name raises ValueError
+#
+#   inferSchema("test.csv", 1)   -> header ['ID', 'NIST Rev5 Controls'], idColumn 0, refColumn 1
+def inferSchema(path, type = 1, header = None, idColumn = None, refColumn = None, keep = (),
+                encoding = "utf-8", sample = _SCHEMA_SAMPLE):
+    with CsvFile(path, encoding) as f:
+        schema = inferRows(list(islice(csv.reader(f.lines()), sample)), type, header, idColumn, refColumn,
+                           keep, "'" + str(path) + "'")
+        schema.start = f.rowEnd(f.start) if schema.header is not None else f.start
+    return schema
+
+# inference of the columns from the first rows of a CSV as by inferSchema,
+# e.g. of a CSV which is not a file, the start of the schema is 0
+#   name = of the CSV in the errors
+def inferRows(rows, type = 1, header = None, idColumn = None, refColumn = None, keep = (), name = "the CSV"):
+    syntax = re.compile(CONTROL_SYNTAX.get(mapDirection(type)[0], _CONTROL_SYNTAX)).fullmatch
+    def tokens(row, column):
+        return "".join(row[column].split()).split(',') if column < len(row) else [""]
+    def references(row, column):
+        return all(t and syntax(t) for t in tokens(row, column))
+    def anyReference(row, column):
+        return any(t and syntax(t) for t in tokens(row, column))
+
+    if keep is None:
+        keep = ()
+    elif isinstance(keep, (str, int)):
+        keep = (keep,)
+    if any(isinstance(c, str) for c in (idColumn, refColumn) + tuple(keep)):
+        header = True
+    first = rows[0] if rows else []
+    data = rows[1:]
+    width = max((len(row) for row in rows), default = 2)
+
+    def score(column):
+        return sum(references(row, column) for row in data) / max(len(data), 1)
+
+    def index(column):
+        if not isinstance(column, str):
+            return column
+        names = [cell.strip() for cell in first]
+        if column.strip() not in names:
+            raise ValueError(f"Unknown column '{column}' of {name}")
+        return names.index(column.strip())
+
+    if refColumn is None:
+        refColumn = 1
+        if width > 2 and score(1) == 0:
+            best = max(range(width), key=lambda c: (score(c), -c))
+            if score(best) > 0:
+                refColumn = best
+    refColumn = index(refColumn)
+
+    inferId = idColumn is None
+    if inferId:
+        idColumn = 0 if refColumn != 0 else 1
+    idColumn = index(idColumn)
+
+    if header is None:
+        cell = first[refColumn].strip() if refColumn < len(first) else ""
+        header = (len(data) > 0
+                  and any(c.isalpha() for c in cell)
+                  and not any(anyReference(first, c) for c in range(len(first)))
+                  and idColumn < len(first)
+                  and _shape(first[idColumn]) not in {_shape(row[idColumn]) for row in data if idColumn < len(row)}
+                  and score(refColumn) >= 0.5)
+    if inferId and header:
+        named = [c for c, cell in enumerate(first) if c != refColumn and _ID_NAME(cell.strip())]
+        if named:
+            idColumn = named[0]
+    keep = tuple(index(c) for c in keep)
+
+    return CsvSchema(first if header and rows else None, idColumn, refColumn, keep, 0, width)
+
+
+# the Map of a worker process, created once per process
+_workerMap = None
+
+# initialisation of a worker process
+#   the mapping list and the overrides are passed from the main process, so
+#   catalogues, chains and overrides registered there are known to the
+#   worker too
+def _initWorker(type, mappingList, overrides, generalisation, encoding, schema, cacheSize, metrics, validation):
+    global _workerMap
+    registerCatalogue(*mapDirection(type), mappingList)
+    if overrides:
+        registerOverrides(*mapDirection(type), overrides)
+    _workerMap = Map(None, None, type, stream = True, cacheSize = cacheSize, metrics = metrics or None,
+                     generalise = generalisation, encoding = encoding, schema = schema,
+                     validate = None if validation is None else Validator(type, *validation))
+
+# mapping of one chunk of a CSV file, returns the mapped chunk, the
+# counters of the metrics and of the validation (None if not enabled)
+#   the chunk is a text in the "csv" or "jsonl" format, the counters of
+#   Coverage for "coverage", otherwise a list of the mapped rows
+#   [id, references, mapped]
+def _mapChunk(path, start, end, format = "csv"):
+    map = _workerMap
+    with CsvFile(path, map._encoding) as f:
+        return _mapChunkRows(map, map._schema.project(csv.reader(f.lines(start, end))), format)
+
+# mapping of the rows of a chunk by the Map of the worker, see _mapChunk
+def _mapChunkRows(map, rows, format):
+    validator = map._validator
+    if validator is not None:
+        validator.reset()
+    if format in ("csv", "jsonl"):
+        out = io.StringIO()
+        writeRows = map.writeRows if format == "csv" else map.writeRowsJsonl
+        write = lambda rows: writeRows(out, rows)
+        result = out.getvalue
+    elif format == "coverage":
+        out = Coverage(map._mapType)
+        write = out.addRows
+        result = out.counters
+    else:
+        out = []
+        write = out.extend
+        result = lambda: out
+    if map._metrics is None:
+        write(map.mapRows(rows))
+        return result(), None, None if validator is None else validator.counters()
+
+    map._metrics = Metrics()
+    rows = map._metrics.stage("read", rows)
+    map._metrics.block("write", write, map.mapRows(rows, "read"), upstream = map._mapStage())
+    return result(), map._metrics.counters(), None if validator is None else validator.counters()
+
+
+# the input files of a batch, the largest ones first, so they do not
+# finish last on a single worker
+#   inputs = a directory (its *.csv files), a glob pattern or a list of paths
+def batchFiles(inputs):
+    import glob
+    if isinstance(inputs, (str, os.PathLike)):
+        inputs = os.fspath(inputs)
+        if os.path.isdir(inputs):
+            paths = glob.glob(os.path.join(glob.escape(inputs), "*.csv"))
+        else:
+            paths = glob.glob(inputs)
+    else:
+        paths = [os.fspath(p) for p in inputs]
+    return sorted(paths, key=lambda p: (-os.path.getsize(p), p))
+
+
+# the output of an input file of a batch in the output directory, the
+# suffix is changed only if the format is given
+def batchOutput(input, outputDir, format = None):
+    name = os.path.basename(input)
+    if format is not None:
+        name = os.path.splitext(name)[0] + "." + format
+    return os.path.join(outputDir, name)
+
+
+# the outputs of the inputs of a batch, resolved before any file is mapped
+#   raises ValueError if two inputs would be written to the same output
+#   (e.g. dir/*/inv.csv) or an output is one of the inputs (e.g. a directory
+#   mapped into itself), which would overwrite it before it is read
+def checkBatchOutputs(paths, outputDir, format = None):
+    outputs = [batchOutput(path, outputDir, format) for path in paths]
+    inputs = {os.path.realpath(path): path for path in paths}
+    seen = {}
+    for path, output in zip(paths, outputs):
+        real = os.path.realpath(output)
+        if real in inputs:
+            raise ValueError(f"The output '{output}' of '{path}' would overwrite the input '{inputs[real]}'")
+        if real in seen:
+            raise ValueError(f"The inputs '{seen[real]}' and '{path}' would be written to the same output '{output}'")
+        seen[real] = path
+    return outputs
+
+# the worker process of a batch, the mapping list and the overrides are
+# passed from the main process as in _initWorker and the engine is
+# compiled once, before the first file
+def _initBatch(type, mappingList, overrides):
+    registerCatalogue(*mapDirection(type), mappingList)
+    if overrides:
+        registerOverrides(*mapDirection(type), overrides)
+    getEngine(type)
+
+# mapping of one file of a batch, returns its summary, the errors of the
+# file are kept in the summary instead of stopping the batch
+#   options = the keyword arguments of Map, compression, format
+def _mapFile(type, input, output, options):
+    options = dict(options)
+    compression = options.pop("compression", None)
+    format = options.pop("format", None)
+    summary = {"input": input, "output": output, "bytes": os.path.getsize(input)}
+    start = time.perf_counter()
+    try:
+        map = Map(input, output, type, stream = True, metrics = True, **options)
+        map.save(compression, format)
+        report = map.metrics()
+        summary["rows"] = report["rows"]
+        summary["unknown_controls"] = report["unknown_controls"]
+        if map.validation() is not None:
+            validation = map.validation()
+            summary["invalid_rows"] = validation["invalid_rows"]
+            summary["errors"] = validation["errors"]
+    except Exception as e:
+        summary["error"] = str(e.args[0] if isinstance(e, KeyError) else e) or e.__class__.__name__
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    return summary
+
+
+# mapping of many inventories at once, e.g. one CSV per business unit
+#   inputs = a directory (its *.csv files), a glob pattern or a list of paths
+#   outputDir = directory of the outputs, with the names of the inputs
+#   workers = number of the workers mapping whole files, 1 maps them one
+#             by one in the current process
+#   pool = "process" or "thread", the kind of the workers
+#   the other arguments as in mapper(), the files are mapped in the stream
+#   mode, the largest first, and each worker compiles the mapping once, the
+#   columns of every file are inferred separately
+#   outputs which would collide or overwrite an input raise ValueError
+#   before any file is mapped, see checkBatchOutputs
+#   returns the report, the summary of every file (rows, seconds, error,
+#   ...) in the order of scheduling and the totals, also written as JSON
+#   to the path report if given
+#
+#   report = mapFiles("inventories/", "mapped/", 1, workers = 8)
+#   report["rows"], report["wall_seconds"], report["files"][0]["seconds"]
+def mapFiles(inputs, outputDir, type = None, workers = 1, pool = "process",
+             source = None, target = None, compression = None, format = None,
+             generalise = True, validate = None, encoding = "utf-8", report = None,
+             header = None, idColumn = None, refColumn = None, keep = ()):
+    if source is not None or target is not None:
+        if source is None or target is None:
+            raise ValueError("Both the source and the target framework must be given")
+        type = (source, target)
+    elif type is None:
+        raise ValueError("Either the map type or the source and target frameworks must be given")
+    if pool not in ("process", "thread"):
+        raise ValueError(f"Unknown pool '{pool}'")
+
+    paths = batchFiles(inputs)
+    if not paths:
+        raise FileNotFoundError(f"No input files in '{inputs}'")
+    outputs = checkBatchOutputs(paths, outputDir, format)
+    os.makedirs(outputDir, exist_ok = True)
+    options = {"compression": compression, "format": format,
+               "generalise": generalise, "validate": validate, "encoding": encoding,
+               "header": header, "idColumn": idColumn, "refColumn": refColumn, "keep": keep}
+    jobs = [(type, path, output, options) for path, output in zip(paths, outputs)]
+    workers = max(min(int(workers), len(jobs)), 1)
+
+    start = time.perf_counter()
+    if workers == 1:
+        getEngine(type)
+        files = [_mapFile(*job) for job in jobs]
+    else:
+        if pool == "process":
+            from concurrent.futures import ProcessPoolExecutor
+            executor = ProcessPoolExecutor(workers, initializer=_initBatch,
+                                           initargs=(type, dict(mappingList(type)), enhancementOverrides(type)))
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+            getEngine(type)
+            executor = ThreadPoolExecutor(workers)
+        with executor:
+            files = [f.result() for f in [executor.submit(_mapFile, *job) for job in jobs]]
+    wall = time.perf_counter() - start
+
+    rows = sum(f.get("rows", 0) for f in files)
+    source, target = mapDirection(type)
+    result = {"map": source + " -> " + target,
+              "workers": workers,
+              "pool": pool if workers > 1 else None,
+              "files": files,
+              "mapped_files": sum(1 for f in files if "error" not in f),
+              "failed_files": sum(1 for f in files if "error" in f),
+              "rows": rows,
+              "bytes": sum(f["bytes"] for f in files),
+              "wall_seconds": round(wall, 6),
+              "file_seconds": round(sum(f["seconds"] for f in files), 6),
+              "rows_per_second": round(rows / wall, 1) if wall > 0 else 0.0,
+              "peak_rss_kb": peakRss()}
+    if report is not None:
+        import json
+        with open(report, 'w') as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+# printing of the report of mapFiles, one line per file and the totals
+def printBatch(report):
+    for f in report["files"]:
+        line = "\t %-40s " % os.path.basename(f["input"])
+        if "error" in f:
+            line += "Error: " + f["error"]
+        else:
+            line += "%9d rows  %8.3f s" % (f["rows"], f["seconds"])
+            if "invalid_rows" in f:
+                line += "  %d invalid rows" % f["invalid_rows"]
+        print(line)
+    print("Mapped files: ", report["mapped_files"], " of ", len(report["files"]),
+          ", rows: ", report["rows"], ", time: ", report["wall_seconds"], " s",
+          ", rows/s: ", report["rows_per_second"])
+
+
+# NumPy is needed only by the batch mapping, it is imported on the first use
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("The batch mapping needs NumPy, install it by: pip install numpy")
+    return numpy
+
+
+# a batch mapping class for very large inventories
+#   the mapping list is compiled into a dense boolean incidence matrix
+#   (integer codes of MapEngine x mapped controls) stored as packed bitsets,
+#   the columns are sorted, so the set bits of a row are directly the sorted
+#   mapped controls, a whole column of references is mapped by vectorised
+#   OR-reductions without a Python loop per control
+#
+#   the rows are given in the CSR form, all codes in one array and the row
+#   boundaries in the offsets, row i is codes[offsets[i]:offsets[i+1]],
+#   unknown controls have the code -1
+#
+#   batch = BatchMap(1)
+#   codes, offsets = batch.encode([['CP-13', 'PE-18'], ['SI-3'], []])
+#   bits = batch.mapCodes(codes, offsets)      -> one packed bitset per row
+#   batch.toLists(bits)                        -> the same lists as in Map
+class BatchMap:
+    def __init__(self, type):
+        ## map type:
+        ##      0 ISO 27001:2022  -> to ->  NIST 800 53 rev 5
+        ##      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
+        np = _numpy()
+        self._np = np
+        self._engine = getEngine(type)
+
+        # the columns, i.e. the mapped controls in the sorted order
+        self._columns = sorted(set().union(*self._engine._targets))
+        column = {t: i for i, t in enumerate(self._columns)}
+
+        matrix = np.zeros((len(self._engine), len(self._columns)), dtype=bool)
+        for code, targets in enumerate(self._engine._targets):
+            for t in targets:
+                matrix[code, column[t]] = True
+        self._matrix = matrix
+        self._packed = np.packbits(matrix, axis=1)
+
+    # the mapped controls, position i is bit i of the bitsets
+    @property
+    def columns(self):
+        return self._columns
+
+    # the incidence matrix, one row per code, one column per mapped control
+    @property
+    def matrix(self):
+        return self._matrix
+
+    # integer codes and offsets (CSR form) of a list of rows of controls
+    #   the unknown controls are resolved by the enhancement index as by
+    #   MapEngine.encode, e.g. SI-3(14) by SI-3, the rest are -1
+    def encode(self, rows):
+        np = self._np
+        get = self._engine._codes.get
+        code = self._engine.code
+        codes = []
+        offsets = [0]
+        for refs in rows:
+            row = [get(r, -1) for r in refs]
+            if -1 in row:
+                row = [-1 if c is None else c for c in map(code, refs)]
+            codes += row
+            offsets.append(len(codes))
+        return np.array(codes, dtype=np.int64), np.array(offsets, dtype=np.int64)
+
+    # mapping of the rows given by codes and offsets
+    #   returns the packed bitsets, an uint8 array of the shape
+    #   (rows, bytes per bitset), the unknown codes (-1) are skipped
+    def mapCodes(self, codes, offsets):
+        np = self._np
+        codes = np.asarray(codes, dtype=np.int64)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        rows = len(offsets) - 1
+
+        # row of every code, the unknown codes are dropped
+        rowOf = np.repeat(np.arange(rows), np.diff(offsets))
+        known = codes >= 0
+        codes = codes[known]
+        rowOf = rowOf[known]
+
+        bits = np.zeros((rows, self._packed.shape[1]), dtype=np.uint8)
+        if len(codes) == 0:
+            return bits
+
+        # the codes are ordered by rows, so each non-empty row is one
+        # contiguous slice reduced by a single bitwise_or.reduceat
+        counts = np.bincount(rowOf, minlength=rows)
+        filled = counts > 0
+        starts = (np.cumsum(counts) - counts)[filled]
+        bits[filled] = np.bitwise_or.reduceat(self._packed[codes], starts, axis=0)
+        return bits
+
+    # sorted lists of the mapped controls of the bitsets, 'None' if the
+    # row is not mapped, i.e. the same lists as the third column in Map
+    def toLists(self, bits):
+        np = self._np
+        matrix = np.unpackbits(bits, axis=1, count=len(self._columns)).astype(bool)
+        columns = self._columns
+        lists = []
+        for row in matrix:
+            mapped = [columns[i] for i in np.flatnonzero(row)]
+            if len(mapped) == 0:
+                mapped.append("None")
+            lists.append(mapped)
+        return lists
+
+    # mapping of a list of rows of controls to the sorted lists
+    def mapRows(self, rows):
+        codes, offsets = self.encode(rows)
+        return self.toLists(self.mapCodes(codes, offsets))
+
+
+# pandas is needed only by the DataFrame mapping, it is imported on the
+# first use
+def _pandas():
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError("The DataFrame mapping needs pandas, install it by: pip install pandas")
+    return pandas
+
+
+# the mapping tables as DataFrames, (source, target) -> (engine, frame)
+_frames = {}
+
+# the mapping list of a map type as a DataFrame of the pairs (ref, mapped),
+# one row per control and mapped control, the controls mapped to nothing
+# are left out, built once per engine, i.e. again after a registration
+def mappingFrame(type):
+    engine = getEngine(type)
+    direction = mapDirection(type)
+    frame = _frames.get(direction)
+    if frame is None or frame[0] is not engine:
+        pd = _pandas()
+        pairs = [(control, t) for control, targets in zip(engine._controls, engine._targets)
+                 for t in sorted(targets)]
+        frame = (engine, pd.DataFrame(pairs, columns=["ref", "mapped"]))
+        _frames[direction] = frame
+    return frame[1]
+
+
+# mapping of a column of a DataFrame with the reference cells, e.g.
+# "CP-13, PE-18", without a CSV in between
+#   the distinct cells are cleaned and split by the vectorised string
+#   methods of pandas, exploded into one row per reference, merged with
+#   the mapping table (mappingFrame) and aggregated back into one sorted
+#   list per row, only the distinct enhancements are resolved one by one
+#   (see MapEngine.generalise), there is no Python loop per row
+#   returns a new Series with the index of the DataFrame, its values are
+#   the same lists as the third column in Map, i.e. ['None'] if nothing
+#   is mapped, a missing cell is mapped as an empty one
+#
+#   df["ISO"] = map_frame(df, "NIST", 1)
+def map_frame(df, source_col, direction = 1, name = None):
+    ## direction = map type, see Map, or a (source, target) pair
+    pd = _pandas()
+    np = _numpy()
+    engine = getEngine(direction)
+    cells = df[source_col]
+
+    # inventories repeat the same cells, only the distinct ones are mapped
+    codes, distinct = pd.factorize(cells.fillna("").astype(str))
+    rows = len(distinct)
+
+    # one row per reference, labelled by the position of its distinct cell
+    refs = (pd.Series(distinct, dtype=object)
+                 .str.replace(r"\s+", "", regex=True)
+                 .str.split(",")
+                 .explode())
+
+    # the enhancements are mapped by the control resolved by the engine
+    enhanced = refs.str.contains("(", regex=False).to_numpy(dtype=bool)
+    if enhanced.any():
+        enhancements = refs[enhanced].unique()
+        refs[enhanced] = refs[enhanced].map(dict(zip(enhancements, map(engine.generalise, enhancements))))
+
+    pairs = (refs.rename("ref").rename_axis("row").reset_index()
+                 .merge(mappingFrame(direction), on="ref")[["row", "mapped"]])
+    unmapped = np.setdiff1d(np.arange(rows), pairs["row"].to_numpy())
+    pairs = (pd.concat([pairs, pd.DataFrame({"row": unmapped, "mapped": "None"})], ignore_index=True)
+               .drop_duplicates()
+               .sort_values(["row", "mapped"]))
+
+    # every row has at least one mapped control, so the sorted controls
+    # are split into the lists at the boundaries of the rows
+    values = pairs["mapped"].tolist()
+    ends = np.cumsum(np.bincount(pairs["row"].to_numpy(), minlength=rows)).tolist()
+    mapped = list(map(values.__getitem__, map(slice, [0] + ends[:-1], ends)))
+
+    # a list of its own for every row, as in Map
+    mapped = list(map(list, map(mapped.__getitem__, codes.tolist())))
+    if name is None:
+        name = mapDirection(direction)[1]
+    return pd.Series(mapped, index=cells.index, name=name, dtype=object)
+
+
+# notes used in the mapping lists instead of a control
+NOTES = ("None", "Withdrawed from 800 53 rev5", "Appendix J Privacy controls")
+
+
+# sorting key of the controls in their natural order
+#   ISO 27001 clauses 4.1 ... 10.2, then Annex A A.5.1.1 ... A.18.2.3,
+#   then NIST 800 53 controls AC-1, AC-2, ..., AC-10, AC-10(1), ...
+#   and anything else at the end
+def controlKey(control):
+    try:
+        if control[:2] == "A.":
+            return (1, tuple(int(p) for p in control[2:].split('.')))
+        if control[:1].isdigit():
+            return (0, tuple(int(p) for p in control.split('.')))
+        family, number = control.split('-')
+        number, _, enhancement = number.partition('(')
+        return (2, (family, int(number), int(enhancement.rstrip(')') or 0)))
+    except ValueError:
+        return (3, (control,))
+
+
+# pairs of controls present in one mapping list but not in the other one
+#   forward = mapping list A -> B, e.g. NISTtoISO13
+#   backward = mapping list B -> A, e.g. ISO13toNIST
+#   returns two lists, the pairs (a, b) only in forward and the pairs
+#   (b, a) only in backward, the notes (NOTES) are not pairs
+def checkConsistency(forward, backward):
+    pairs = {(a, b) for a in forward for b in forward[a] if b not in NOTES}
+    inverse = {(a, b) for b in backward for a in backward[b] if a not in NOTES}
+    onlyForward = sorted(pairs - inverse, key=lambda p: (controlKey(p[0]), controlKey(p[1])))
+    onlyBackward = sorted(((b, a) for a, b in inverse - pairs), key=lambda p: (controlKey(p[0]), controlKey(p[1])))
+    return onlyForward, onlyBackward
+
+
+# the bidirectional index of the mapping, both mapping lists are derived
+# from the single canonical list NIST_ISO13 (and ISO13_NOTES)
+class MapIndex:
+    def __init__(self, NISTtoISO13, ISO13toNIST):
+        self.NISTtoISO13 = NISTtoISO13
+        self.ISO13toNIST = ISO13toNIST
+
+    # the mapping list of a map type
+    #      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
+    #      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
+    def mappingList(self, type):
+        if type == 0:
+            return self.ISO13toNIST
+        return self.NISTtoISO13
+
+    # pairs present in one direction but not in the other one,
+    # see checkConsistency
+    def check(self):
+        return checkConsistency(self.NISTtoISO13, self.ISO13toNIST)
+
+
+# building of the index from the canonical list
+def _buildIndex():
+    NISTtoISO13 = {}
+    ISO13toNIST = {}
+    for nist, isos in NIST_ISO13:
+        NISTtoISO13[nist] = list(isos)
+        for iso in isos:
+            if iso not in NOTES:
+                ISO13toNIST.setdefault(iso, []).append(nist)
+    for iso, note in ISO13_NOTES:
+        ISO13toNIST.setdefault(iso, []).append(note)
+
+    ISO13toNIST = {iso: sorted(ISO13toNIST[iso], key=controlKey)
+                   for iso in sorted(ISO13toNIST, key=controlKey)}
+    return MapIndex(NISTtoISO13, ISO13toNIST)
+
+
+# version of the cached index, increase it when MapIndex changes
+_INDEX_VERSION = 2
+
+# the disk cache of the index, in __pycache__ next to this module
+def _indexCachePath():
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__", "mapper_index.marshal")
+
+# loading of the index from the disk cache, the index is rebuilt (and the
+# cache rewritten) when the cache is missing or this module has changed
+#   marshal is built in the interpreter, unlike pickle it costs no import
+#   at the start
+def _loadIndex():
+    import marshal
+
+    path = _indexCachePath()
+    try:
+        st = os.stat(__file__)
+    except OSError:
+        return _buildIndex()
+    key = (_INDEX_VERSION, st.st_mtime_ns, st.st_size)
+
+    try:
+        with open(path, 'rb') as f:
+            cached = marshal.load(f)
+        if cached[0] == key:
+            return MapIndex(*cached[1])
+    except Exception:
+        # missing, stale or broken cache
+        pass
+
+    index = _buildIndex()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + "." + str(os.getpid())
+        with open(tmp, 'wb') as f:
+            marshal.dump((key, (index.NISTtoISO13, index.ISO13toNIST)), f)
+        os.replace(tmp, path)
+    except OSError:
+        # e.g. a read only installation, the index is built on every start
+        pass
+    return index
+
+
+_index = None
+
+# the index of the mapping, built or loaded on the first use
+def mappingIndex():
+    global _index
+    if _index is None:
+        _index = _loadIndex()
+    return _index
+
+# the mapping list of a map type
+#      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
+#      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
+#      (source, target) frameworks of a registered catalogue
+def mappingList(type):
+    return catalogue(*mapDirection(type))
+
+
+# names of the built-in frameworks
+NIST800_53R5 = "NIST800-53r5"
+ISO27001_2013 = "ISO27001:2013"
+
+# the (source, target) frameworks of a map type, the integer types
+#      0 ISO 27001:2013  -> to ->  NIST 800 53 rev 5
+#      1 NIST 800 53 rev 5 -> to -> ISO 27001:2013
+# are kept for the older code, a (source, target) pair is returned as it is
+def mapDirection(type):
+    if isinstance(type, tuple):
+        return type
+    if type == 0:
+        return (ISO27001_2013, NIST800_53R5)
+    return (NIST800_53R5, ISO27001_2013)
+
+
+# the binary catalogue file of a mapping list
+#   all numbers are little endian uint32
+#
+#   magic       b"MAPCAT\0\1"
+#   header      number of strings, sources, target references,
+#               string id of the source and of the target framework, 0
+#   offsets     (strings + 1) offsets of the strings in the blob
+#   sources     per source control: string id, first target reference,
+#               number of target references
+#   targets     string ids of the target controls
+#   blob        the UTF-8 strings
+#
+#   the file is memory-mapped, nothing but the header is read until the
+#   catalogue is used
+_CATALOGUE_MAGIC = b"MAPCAT\0\1"
+_CATALOGUE_HEADER = 8 + 6 * 4
+
+
+# unsigned 32 bit little endian array of a part of a memory-mapped file
+def _uint32(buffer, start, count):
+    view = memoryview(buffer)[start:start + 4 * count].cast('I')
+    if sys.byteorder == 'little':
+        return view
+    import array
+    values = array.array('I', view)
+    values.byteswap()
+    return values
+
+
+# writing of a mapping list (a dict control -> list of controls) to a
+# binary catalogue file
+def writeCatalogue(path, source, target, mappingList):
+    import array
+
+    strings = {}
+    def stringId(s):
+        return strings.setdefault(s, len(strings))
+
+    header = [0, len(mappingList), 0, stringId(source), stringId(target), 0]
+    sources = array.array('I')
+    targets = array.array('I')
+    for key in mappingList:
+        sources.extend((stringId(key), len(targets), len(mappingList[key])))
+        targets.extend(stringId(t) for t in mappingList[key])
+    header[0] = len(strings)
+    header[2] = len(targets)
+
+    blob = bytearray()
+    offsets = array.array('I', [0])
+    for s in strings:
+        blob += s.encode('utf-8')
+        offsets.append(len(blob))
+
+    numbers = [array.array('I', header), offsets, sources, targets]
+    with open(path, 'wb') as f:
+        f.write(_CATALOGUE_MAGIC)
+        for a in numbers:
+            if sys.byteorder != 'little':
+                a.byteswap()
+            f.write(a.tobytes())
+        f.write(blob)
+
+
+# compiling of a catalogue file from a CSV in the same format as the input
+# of Map, the first column is the source control, the second one are the
+# target controls separated by comma, rows of the same source are merged
+def compileCatalogue(csvPath, path, source, target, skipHeader = False):
+    mappingList = {}
+    with open(csvPath, 'r', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        if skipHeader:
+            next(reader, None)
+        for row in reader:
+            if len(row) < 2 or not row[0].strip():
+                continue
+            targets = mappingList.setdefault("".join(row[0].split()), [])
+            for t in tokenize(row[1], False):
+                if t and t not in targets:
+                    targets.append(t)
+    writeCatalogue(path, source, target, mappingList)
+
+
+# reading of the source and target framework of a catalogue file
+def readCatalogueHeader(path):
+    catalogue = CatalogueFile(path)
+    return catalogue.source, catalogue.target
+
+
+# a mapping list stored in a memory-mapped catalogue file
+#   it is a read only dict, control -> list of controls, so it can be used
+#   everywhere a mapping list (such as NISTtoISO13) is used
+class CatalogueFile(Mapping):
+    def __init__(self, path):
+        import mmap
+
+        self._path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:8] != _CATALOGUE_MAGIC:
+            raise ValueError(f"'{path}' is not a mapping catalogue")
+
+        strings, sources, targets, source, target, _ = _uint32(self._mm, 8, 6)
+        start = _CATALOGUE_HEADER
+        self._offsets = _uint32(self._mm, start, strings + 1)
+        start += 4 * (strings + 1)
+        self._sources = _uint32(self._mm, start, 3 * sources)
+        start += 4 * 3 * sources
+        self._targets = _uint32(self._mm, start, targets)
+        self._blob = start + 4 * targets
+
+        self.source = self._string(source)
+        self.target = self._string(target)
+        self._keys = None
+
+    def _string(self, i):
+        return self._mm[self._blob + self._offsets[i]:self._blob + self._offsets[i + 1]].decode('utf-8')
+
+    # position of every source control, read on the first lookup
+    def _index(self):
+        if self._keys is None:
+            self._keys = {self._string(self._sources[3 * i]): i for i in range(len(self._sources) // 3)}
+        return self._keys
+
+    def __getitem__(self, key):
+        i = self._index()[key]
+        first = self._sources[3 * i + 1]
+        count = self._sources[3 * i + 2]
+        return [self._string(t) for t in self._targets[first:first + count]]
+
+    def __iter__(self):
+        return iter(self._index())
+
+    def __len__(self):
+        return len(self._sources) // 3
+
+
+# the registry of the catalogues, (source, target) -> loader of the mapping
+# list, the loaders are called on the first use only
+_catalogueLoaders = {
+    (NIST800_53R5, ISO27001_2013): lambda: mappingIndex().NISTtoISO13,
+    (ISO27001_2013, NIST800_53R5): lambda: mappingIndex().ISO13toNIST,
 }
+_catalogues = {}
+
+# directory with the catalogue files registered on the first unknown
+# framework, next to this module
+CATALOGUE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogues")
+_catalogueDirLoaded = False
+
+
+# registering of a catalogue
+#   catalogue = path to a catalogue file, a mapping list (dict) or
+#               a function returning a mapping list
+def registerCatalogue(source, target, catalogue):
+    if isinstance(catalogue, (str, os.PathLike)):
+        path = catalogue
+        loader = lambda: CatalogueFile(path)
+    elif callable(catalogue):
+        loader = catalogue
+    else:
+        loader = lambda: catalogue
+    _catalogueLoaders[(source, target)] = loader
+    _catalogues.pop((source, target), None)
+    _engines.pop((source, target), None)
+
+
+# registering of all catalogue files (*.mapcat) of a directory, only the
+# headers of the files are read
+def registerCatalogueDir(directory):
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".mapcat"):
+            path = os.path.join(directory, name)
+            source, target = readCatalogueHeader(path)
+            registerCatalogue(source, target, path)
+
+
+def _loadCatalogueDir():
+    global _catalogueDirLoaded
+    if not _catalogueDirLoaded:
+        _catalogueDirLoaded = True
+        if os.path.isdir(CATALOGUE_DIR):
+            registerCatalogueDir(CATALOGUE_DIR)
+
+
+# the (source, target) pairs of all registered catalogues
+def frameworks():
+    _loadCatalogueDir()
+    return list(_catalogueLoaders)
+
+
+# the mapping list of a source and a target framework, loaded on the first use
+def catalogue(source, target):
+    key = (source, target)
+    if key not in _catalogues:
+        if key not in _catalogueLoaders:
+            _loadCatalogueDir()
+        if key not in _catalogueLoaders:
+            raise KeyError(f"No catalogue for mapping '{source}' -> '{target}'")
+        _catalogues[key] = _catalogueLoaders[key]()
+    return _catalogues[key]
+
+
+# a transitive (multi-hop) mapping list composed from a chain of catalogues
+#   e.g. internal controls -> NIST 800 53 -> ISO 27001 is composed once
+#   into a single mapping list internal -> ISO 27001, so the CSV is mapped
+#   in a single pass, the intermediate controls which are not a source of
+#   the next catalogue (e.g. 'None') are dropped on the way, an intermediate
+#   enhancement such as AC-2(3) is mapped by its base control unless it has
+#   an own mapping, as by a direct mapping
+#
+#   with provenance = True, the intermediate controls producing each
+#   target are recorded, see via() and explain()
+#
+#   chain = Chain(["INTERNAL", NIST800_53R5, ISO27001_2013], provenance = True)
+#   chain["CM-7"]                   -> ['A.12.1.2', ...]
+#   chain.via("CM-7", "A.12.1.2")   -> [('CM-3',), ('CM-5',)]
+class Chain(Mapping):
+    def __init__(self, frameworks, provenance = False):
+        frameworks = tuple(frameworks)
+        if len(frameworks) < 2:
+            raise ValueError("A chain needs at least two frameworks")
+        self.frameworks = frameworks
+        self.source = frameworks[0]
+        self.target = frameworks[-1]
+        # the compiled engine of every hop with its overrides, an intermediate
+        # enhancement is mapped by the hop as by a direct mapping, i.e. by
+        # its own mapping or by its base control, see MapEngine.code
+        engines = [getEngine((a, b)) for a, b in zip(frameworks, frameworks[1:])]
+
+        self._table = {}
+        self._via = {} if provenance else None
+        for source in engines[0]._controls:
+            # reached controls -> set of the paths of intermediate controls
+            reached = {source: {()}}
+            for hop, engine in enumerate(engines):
+                nextReached = {}
+                for control, paths in reached.items():
+                    if hop > 0:
+                        paths = {path + (control,) for path in paths}
+                    code = engine.code(control)
+                    for t in engine._targets[code] if code is not None else ():
+                        nextReached.setdefault(t, set()).update(paths)
+                reached = nextReached
+
+            self._table[source] = sorted(reached) or ["None"]
+            if provenance:
+                for t, paths in reached.items():
+                    self._via[(source, t)] = sorted(paths)
+
+    def __getitem__(self, key):
+        return self._table[key]
+
+    def __iter__(self):
+        return iter(self._table)
+
+    def __len__(self):
+        return len(self._table)
+
+    # the paths of intermediate controls from a source to a target control
+    def via(self, source, target):
+        if self._via is None:
+            raise ValueError("The chain was composed without provenance")
+        return self._via.get((source, target), [])
+
+    # mapping of a row with the provenance, target -> list of the paths
+    # (source control, intermediate controls...) producing the target
+    def explain(self, refs):
+        if self._via is None:
+            raise ValueError("The chain was composed without provenance")
+        result = {}
+        for ref in refs:
+            for t in self._table.get(ref, ()):
+                for path in self._via.get((ref, t), ()):
+                    result.setdefault(t, []).append((ref,) + path)
+        return result
+
+
+# registering of a chain of frameworks as the catalogue of its first and
+# last framework, the chain is composed on the first use and then cached
+# as any other catalogue, so Map(source = first, target = last) maps in
+# a single pass
+def registerChain(frameworks, provenance = False):
+    frameworks = tuple(frameworks)
+    if (frameworks[0], frameworks[-1]) in zip(frameworks, frameworks[1:]):
+        raise ValueError("The chain cannot replace one of its own catalogues")
+    registerCatalogue(frameworks[0], frameworks[-1], lambda: Chain(frameworks, provenance))
+    _engines.pop((frameworks[0], frameworks[-1]), None)
+
+
+# coverage of the controls of the target framework by mapped inventories
+#   (gap analysis), every control of the target framework has a counter of
+#   the mapped rows covering it, the controls are all the keys of the
+#   reverse mapping list (e.g. all the ISO controls of ISO13toNIST for
+#   NIST -> ISO) and all the mapped ones
+#      covered = by at least one row
+#      uncovered = by no row, reported with the source controls which
+#                  would cover it
+#      over-covered = by more than overCovered rows
+#   the coverages of parts of an inventory (shards, parallel chunks) can be
+#   merged
+#
+#   coverage = Coverage(1)
+#   coverage.addRows(rows)          # the rows mapped by Map, [id, references, mapped]
+#   coverage.merge(otherCoverage)
+#   coverage.report()               -> {"covered": {...}, "uncovered": {...}, ...}
+class Coverage:
+    def __init__(self, type, overCovered = 3):
+        self._type = type
+        self.overCovered = overCovered
+        source, target = mapDirection(type)
+
+        # the reverse index, target control -> source controls mapped to it
+        forward = catalogue(source, target)
+        self._sources = {}
+        for control in forward:
+            for mapped in forward[control]:
+                if mapped not in NOTES:
+                    self._sources.setdefault(mapped, []).append(control)
+        controls = set(self._sources)
+        try:
+            backward = catalogue(target, source)
+            # the withdrawn controls cannot be covered
+            controls.update(c for c in backward if c not in NOTES and list(backward[c]) != [NOTES[1]])
+        except KeyError:
+            # no reverse catalogue, only the mapped controls are known
+            pass
+
+        self.controls = tuple(sorted(controls, key=controlKey))
+        self._position = {control: i for i, control in enumerate(self.controls)}
+        self._counts = [0] * len(self.controls)
+        self.rows = 0
+        # mapped controls out of the controls of the target framework
+        self.unknown = 0
+
+    # counting of the mapped controls of one row
+    def add(self, mapped):
+        counts = self._counts
+        position = self._position
+        self.rows += 1
+        for control in mapped:
+            i = position.get(control)
+            if i is not None:
+                counts[i] += 1
+            elif control not in NOTES:
+                self.unknown += 1
+
+    # counting of the rows mapped by Map, [id, references, mapped]
+    def addRows(self, rows):
+        for row in rows:
+            self.add(row[2])
+        return self
+
+    # number of the rows covering a control
+    def __getitem__(self, control):
+        return self._counts[self._position[control]]
+
+    # the raw counters, e.g. to be sent from a worker process
+    def counters(self):
+        return {"map": mapDirection(self._type), "counts": self._counts,
+                "rows": self.rows, "unknown": self.unknown}
+
+    # adding of another Coverage (or its counters) of the same mapping
+    def merge(self, other):
+        if isinstance(other, Coverage):
+            other = other.counters()
+        if tuple(other["map"]) != mapDirection(self._type) or len(other["counts"]) != len(self._counts):
+            raise ValueError("Only coverages of the same mapping can be merged")
+        self._counts = [a + b for a, b in zip(self._counts, other["counts"])]
+        self.rows += other["rows"]
+        self.unknown += other["unknown"]
+        return self
+
+    def report(self):
+        counts = self._counts
+        covered = {c: n for c, n in zip(self.controls, counts) if n > 0}
+        source, target = mapDirection(self._type)
+        return {"map": source + " -> " + target,
+                "rows": self.rows,
+                "controls": len(self.controls),
+                "covered_controls": len(covered),
+                "coverage": round(len(covered) / len(self.controls), 4) if self.controls else 0.0,
+                "unknown_controls": self.unknown,
+                "covered": covered,
+                "uncovered": {c: self._sources.get(c, []) for c, n in zip(self.controls, counts) if n == 0},
+                "over_covered": {c: n for c, n in covered.items() if n > self.overCovered}}
+
+    # writing of the report to a JSON file
+    def write(self, path):
+        import json
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+# NISTtoISO13 and ISO13toNIST are not built at the import any more,
+# they are attributes of the module created on the first access
+def __getattr__(name):
+    if name == "NISTtoISO13":
+        return mappingIndex().NISTtoISO13
+    if name == "ISO13toNIST":
+        return mappingIndex().ISO13toNIST
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# the canonical mapping list, NIST 800 53 rev 5 control -> ISO 27001:2013 controls
+#   NISTtoISO13 and ISO13toNIST are both derived from it, the NIST controls
+#   without any ISO control have a note instead ('None' or withdrawn)
+NIST_ISO13 = (
+('AC-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.9.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('AC-2', ('A.9.2.1','A.9.2.2','A.9.2.3','A.9.2.5','A.9.2.6')),
+('AC-3', ('A.6.2.2','A.9.1.2','A.9.4.1','A.9.4.4','A.9.4.5','A.13.1.1','A.14.1.2','A.14.1.3','A.18.1.3')),
+('AC-4', ('A.13.1.3','A.13.2.1','A.14.1.2','A.14.1.3')),
+('AC-5', ('A.6.1.2',)),
+('AC-6', ('A.9.1.2','A.9.2.3','A.9.4.4','A.9.4.5')),
+('AC-7', ('A.9.4.2',)),
+('AC-8', ('A.9.4.2',)),
+('AC-9', ('A.9.4.2',)),
+('AC-10', ('None',)),
+('AC-11', ('A.11.2.8','A.11.2.9')),
+('AC-12', ('None',)),
+('AC-13', ('Withdrawed from 800 53 rev5',)),
+('AC-14', ('None',)),
+('AC-15', ('Withdrawed from 800 53 rev5',)),
+('AC-16', ('None',)),
+('AC-17', ('A.6.2.1','A.6.2.2','A.13.1.1','A.13.2.1','A.14.1.2')),
+('AC-18', ('A.6.2.1','A.13.1.1','A.13.2.1')),
+('AC-19', ('A.6.2.1','A.11.1.5','A.11.2.6','A.13.2.1')),
+('AC-20', ('A.11.2.6','A.13.1.1','A.13.2.1')),
+('AC-21', ('None',)),
+('AC-22', ('None',)),
+('AC-23', ('None',)),
+('AC-24', ('A.9.4.1',)),
+('AC-25', ('None',)),
+('AT-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('AT-2', ('7.3','A.7.2.2','A.12.2.1')),
+('AT-3', ('A.7.2.2',)),
+('AT-4', ('None',)),
+('AT-5', ('Withdrawed from 800 53 rev5',)),
+('AT-6', ('None',)),
+('AU-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('AU-2', ('None',)),
+('AU-3', ('A.12.4.1',)),
+('AU-4', ('A.12.1.3',)),
+('AU-5', ('None',)),
+('AU-6', ('A.12.4.1','A.16.1.2','A.16.1.4')),
+('AU-7', ('None',)),
+('AU-8', ('A.12.4.4',)),
+('AU-9', ('A.12.4.2','A.12.4.3','A.18.1.3')),
+('AU-10', ('None',)),
+('AU-11', ('A.12.4.1','A.16.1.7')),
+('AU-12', ('A.12.4.1','A.12.4.3')),
+('AU-13', ('None',)),
+('AU-14', ('A.12.4.1',)),
+('AU-15', ('Withdrawed from 800 53 rev5',)),
+('AU-16', ('None',)),
+('CA-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('CA-2', ('A.14.2.8','A.18.2.2','A.18.2.3')),
+('CA-3', ('A.13.1.2','A.13.2.1','A.13.2.2')),
+('CA-4', ('Withdrawed from 800 53 rev5',)),
+('CA-5', ('8.3','9.2','10.1')),
+('CA-6', ('9.3',)),
+('CA-7', ('9.1','9.2','A.18.2.2','A.18.2.3')),
+('CA-8', ('None',)),
+('CA-9', ('None',)),
+('CM-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('CM-2', ('None',)),
+('CM-3', ('8.1','A.12.1.2','A.14.2.2','A.14.2.3','A.14.2.4')),
+('CM-4', ('A.14.2.3',)),
+('CM-5', ('A.9.2.3','A.9.4.5','A.12.1.2','A.12.1.4','A.12.5.1')),
+('CM-6', ('None',)),
+('CM-7', ('A.12.5.1',)),
+('CM-8', ('A.8.1.1','A.8.1.2')),
+('CM-9', ('A.6.1.1',)),
+('CM-10', ('A.18.1.2',)),
+('CM-11', ('A.12.5.1','A.12.6.2')),
+('CM-12', ('None',)),
+('CM-13', ('None',)),
+('CM-14', ('None',)),
+('CP-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('CP-2', ('7.5.1','7.5.2','7.5.3','A.6.1.1','A.17.1.1','A.17.2.1')),
+('CP-3', ('A.7.2.2',)),
+('CP-4', ('A.17.1.3',)),
+('CP-5', ('Withdrawed from 800 53 rev5',)),
+('CP-6', ('A.11.1.4','A.17.1.2','A.17.2.1')),
+('CP-7', ('A.11.1.4','A.17.1.2','A.17.2.1')),
+('CP-8', ('A.11.2.2','A.17.1.2')),
+('CP-9', ('A.12.3.1','A.17.1.2','A.18.1.3')),
+('CP-10', ('A.17.1.2',)),
+('CP-11', ('A.17.1.2',)),
+('CP-12', ('None',)),
+('CP-13', ('A.17.1.2',)),
+('IA-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('IA-2', ('A.9.2.1',)),
+('IA-3', ('None',)),
+('IA-4', ('A.9.2.1',)),
+('IA-5', ('A.9.2.1','A.9.2.4','A.9.3.1','A.9.4.3')),
+('IA-6', ('A.9.4.2',)),
+('IA-7', ('A.18.1.5',)),
+('IA-8', ('A.9.2.1',)),
+('IA-9', ('None',)),
+('IA-10', ('None',)),
+('IA-11', ('None',)),
+('IA-12', ('None',)),
+('IR-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('IR-2', ('A.7.2.2',)),
+('IR-3', ('None',)),
+('IR-4', ('A.16.1.4','A.16.1.5','A.16.1.6')),
+('IR-5', ('None',)),
+('IR-6', ('A.6.1.3','A.16.1.2')),
+('IR-7', ('None',)),
+('IR-8', ('7.5.1','7.5.2','7.5.3','A.16.1.1')),
+('IR-9', ('None',)),
+('IR-10', ('Withdrawed from 800 53 rev5',)),
+('MA-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('MA-2', ('A.11.2.4','A.11.2.5')),
+('MA-3', ('None',)),
+('MA-4', ('None',)),
+('MA-5', ('None',)),
+('MA-6', ('A.11.2.4',)),
+('MA-7', ('None',)),
+('MP-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('MP-2', ('A.8.2.3','A.8.3.1','A.11.2.9')),
+('MP-3', ('A.8.2.2',)),
+('MP-4', ('A.8.2.3','A.8.3.1','A.11.2.9')),
+('MP-5', ('A.8.2.3','A.8.3.1','A.8.3.3','A.11.2.5','A.11.2.6')),
+('MP-6', ('A.8.2.3','A.8.3.1','A.8.3.2','A.11.2.7')),
+('MP-7', ('A.8.2.3','A.8.3.1')),
+('MP-8', ('None',)),
+('PE-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('PE-2', ('A.11.1.2',)),
+('PE-3', ('A.11.1.1','A.11.1.2','A.11.1.3')),
+('PE-4', ('A.11.1.2','A.11.2.3')),
+('PE-5', ('A.11.1.2','A.11.1.3')),
+('PE-6', ('None',)),
+('PE-7', ('Withdrawed from 800 53 rev5',)),
+('PE-8', ('None',)),
+('PE-9', ('A.11.1.4','A.11.2.1','A.11.2.2','A.11.2.3')),
+('PE-10', ('A.11.2.2',)),
+('PE-11', ('A.11.2.2',)),
+('PE-12', ('A.11.2.2',)),
+('PE-13', ('A.11.1.4','A.11.2.1')),
+('PE-14', ('A.11.1.4','A.11.2.1','A.11.2.2')),
+('PE-15', ('A.11.1.4','A.11.2.1','A.11.2.2')),
+('PE-16', ('A.8.2.3','A.11.1.6','A.11.2.5')),
+('PE-17', ('A.6.2.2','A.11.2.6','A.13.2.1')),
+('PE-18', ('A.8.2.3','A.11.1.4','A.11.2.1')),
+('PE-19', ('A.11.1.4','A.11.2.1')),
+('PE-20', ('A.8.2.3',)),
+('PE-21', ('None',)),
+('PE-22', ('A.8.2.2',)),
+('PE-23', ('A.11.1.4','A.11.2.1')),
+('PL-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('PL-2', ('7.5.1','7.5.2','7.5.3','10.1','A.14.1.1')),
+('PL-3', ('Withdrawed from 800 53 rev5',)),
+('PL-4', ('A.7.1.2','A.7.2.1','A.8.1.3')),
+('PL-5', ('Withdrawed from 800 53 rev5',)),
+('PL-6', ('Withdrawed from 800 53 rev5',)),
+('PL-7', ('8.1','A.14.1.1')),
+('PL-8', ('A.14.1.1',)),
+('PL-9', ('None',)),
+('PL-10', ('None',)),
+('PL-11', ('None',)),
+('PM-1', ('4.1','4.2','4.3','4.4','5.2','5.3','6.1.1','6.2','7.4','7.5.1','7.5.2','7.5.3','8.1','9.3','10.2','A.5.1.1','A.5.1.2','A.6.1.1','A.18.1.1','A.18.2.2')),
+('PM-2', ('5.1','5.3','A.6.1.1')),
+('PM-3', ('5.1','6.2','7.1')),
+('PM-4', ('6.1.1','6.2','7.5.1','7.5.2','7.5.3','8.3','9.2','9.3','10.1')),
+('PM-5', ('None',)),
+('PM-6', ('5.3','6.1.1','6.2','9.1')),
+('PM-7', ('None',)),
+('PM-8', ('None',)),
+('PM-9', ('4.3','4.4','6.1.1','6.1.2','6.2','7.5.1','7.5.2','7.5.3','9.3','10.2')),
+('PM-10', ('9.3','A.6.1.1')),
+('PM-11', ('4.1',)),
+('PM-12', ('None',)),
+('PM-13', ('7.2','A.7.2.2')),
+('PM-14', ('6.2',)),
+('PM-15', ('7.4','A.6.1.4')),
+('PM-16', ('None',)),
+('PM-17', ('None',)),
+('PM-18', ('None',)),
+('PM-19', ('None',)),
+('PM-20', ('None',)),
+('PM-21', ('None',)),
+('PM-22', ('None',)),
+('PM-23', ('None',)),
+('PM-24', ('None',)),
+('PM-25', ('None',)),
+('PM-26', ('None',)),
+('PM-27', ('None',)),
+('PM-28', ('4.3','6.1.2','6.2','7.4','7.5.1','7.5.2','7.5.3')),
+('PM-29', ('5.1','5.3','9.2','A.6.1.1')),
+('PM-30', ('4.4','6.2','7.5.1','7.5.2','7.5.3','10.2')),
+('PM-31', ('4.4','6.2','7.4','7.5.1','7.5.2','7.5.3','9.1','10.1','10.2')),
+('PM-32', ('None',)),
+('PS-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('PS-2', ('None',)),
+('PS-3', ('A.7.1.1',)),
+('PS-4', ('A.7.3.1','A.8.1.4')),
+('PS-5', ('A.7.3.1','A.8.1.4')),
+('PS-6', ('A.7.1.2','A.7.2.1','A.13.2.4')),
+('PS-7', ('A.6.1.1','A.7.2.1')),
+('PS-8', ('7.3','A.7.2.3')),
+('PS-9', ('A.6.1.1',)),
+('PT-1', ('None',)),
+('PT-2', ('None',)),
+('PT-3', ('None',)),
+('PT-4', ('None',)),
+('PT-5', ('None',)),
+('PT-6', ('None',)),
+('PT-7', ('None',)),
+('PT-8', ('None',)),
+('RA-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('RA-2', ('A.8.2.1',)),
+('RA-3', ('6.1.2','8.2','A.12.6.1')),
+('RA-4', ('Withdrawed from 800 53 rev5',)),
+('RA-5', ('A.12.6.1',)),
+('RA-6', ('None',)),
+('RA-7', ('6.1.3','8.3','10.1')),
+('RA-8', ('None',)),
+('RA-9', ('A.15.2.2',)),
+('RA-10', ('None',)),
+('SA-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','8.1','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('SA-2', ('None',)),
+('SA-3', ('A.6.1.1','A.6.1.5','A.14.1.1','A.14.2.1','A.14.2.6')),
+('SA-4', ('8.1','A.14.1.1','A.14.2.7','A.14.2.9','A.15.1.2')),
+('SA-5', ('7.5.1','7.5.2','7.5.3','A.12.1.1')),
+('SA-6', ('Withdrawed from 800 53 rev5',)),
+('SA-7', ('Withdrawed from 800 53 rev5',)),
+('SA-8', ('A.14.2.5',)),
+('SA-9', ('A.6.1.1','A.6.1.5','A.7.2.1','A.13.1.2','A.13.2.2','A.15.2.1','A.15.2.2')),
+('SA-10', ('A.12.1.2','A.14.2.2','A.14.2.4','A.14.2.7')),
+('SA-11', ('A.14.2.7','A.14.2.8')),
+('SA-12', ('Withdrawed from 800 53 rev5',)),
+('SA-13', ('Withdrawed from 800 53 rev5',)),
+('SA-14', ('Withdrawed from 800 53 rev5',)),
+('SA-15', ('A.6.1.5','A.14.2.1')),
+('SA-16', ('None',)),
+('SA-17', ('A.14.2.1','A.14.2.5')),
+('SA-18', ('Withdrawed from 800 53 rev5',)),
+('SA-19', ('Withdrawed from 800 53 rev5',)),
+('SA-20', ('None',)),
+('SA-21', ('A.7.1.1',)),
+('SA-22', ('None',)),
+('SA-23', ('None',)),
+('SC-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('SC-2', ('None',)),
+('SC-3', ('None',)),
+('SC-4', ('None',)),
+('SC-5', ('None',)),
+('SC-6', ('None',)),
+('SC-7', ('A.13.1.1','A.13.1.3','A.13.2.1','A.14.1.3')),
+('SC-8', ('A.8.2.3','A.13.1.1','A.13.2.1','A.13.2.3','A.14.1.2','A.14.1.3')),
+('SC-9', ('Withdrawed from 800 53 rev5',)),
+('SC-10', ('A.13.1.1',)),
+('SC-11', ('None',)),
+('SC-12', ('A.10.1.2',)),
+('SC-13', ('A.10.1.1','A.14.1.2','A.14.1.3','A.18.1.5')),
+('SC-14', ('Withdrawed from 800 53 rev5',)),
+('SC-15', ('A.13.2.1',)),
+('SC-16', ('None',)),
+('SC-17', ('A.10.1.2',)),
+('SC-18', ('None',)),
+('SC-19', ('None',)),
+('SC-20', ('None',)),
+('SC-21', ('None',)),
+('SC-22', ('None',)),
+('SC-23', ('None',)),
+('SC-24', ('None',)),
+('SC-25', ('None',)),
+('SC-26', ('None',)),
+('SC-27', ('None',)),
+('SC-28', ('A.8.2.3',)),
+('SC-29', ('None',)),
+('SC-30', ('None',)),
+('SC-31', ('None',)),
+('SC-32', ('None',)),
+('SC-33', ('Withdrawed from 800 53 rev5',)),
+('SC-34', ('None',)),
+('SC-35', ('None',)),
+('SC-36', ('None',)),
+('SC-37', ('None',)),
+('SC-38', ('A.12.1.1','A.12.1.2','A.12.1.3','A.12.1.4','A.12.2.1','A.12.3.1','A.12.4.1','A.12.4.2','A.12.4.3','A.12.4.4','A.12.5.1','A.12.6.1','A.12.6.2','A.12.7.1')),
+('SC-39', ('None',)),
+('SC-40', ('None',)),
+('SC-41', ('None',)),
+('SC-42', ('A.11.1.5',)),
+('SC-43', ('None',)),
+('SC-44', ('None',)),
+('SC-45', ('None',)),
+('SC-46', ('None',)),
+('SC-47', ('None',)),
+('SC-48', ('None',)),
+('SC-49', ('None',)),
+('SC-50', ('None',)),
+('SC-51', ('None',)),
+('SI-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.18.1.1','A.18.2.2')),
+('SI-2', ('A.12.6.1','A.14.2.2','A.14.2.3','A.16.1.3')),
+('SI-3', ('A.12.2.1',)),
+('SI-4', ('None',)),
+('SI-5', ('A.6.1.4',)),
+('SI-6', ('None',)),
+('SI-7', ('None',)),
+('SI-8', ('None',)),
+('SI-9', ('Withdrawed from 800 53 rev5',)),
+('SI-10', ('None',)),
+('SI-11', ('None',)),
+('SI-12', ('None',)),
+('SI-13', ('None',)),
+('SI-14', ('None',)),
+('SI-15', ('None',)),
+('SI-16', ('None',)),
+('SI-17', ('None',)),
+('SI-18', ('None',)),
+('SI-19', ('None',)),
+('SI-20', ('None',)),
+('SI-21', ('None',)),
+('SI-22', ('None',)),
+('SI-23', ('None',)),
+('SR-1', ('5.2','5.3','7.5.1','7.5.2','7.5.3','A.5.1.1','A.5.1.2','A.6.1.1','A.12.1.1','A.15.1.1','A.18.1.1','A.18.2.2')),
+('SR-2', ('A.14.2.7',)),
+('SR-3', ('A.15.1.2','A.15.1.3')),
+('SR-4', ('A.14.2.7',)),
+('SR-5', ('A.15.1.3',)),
+('SR-6', ('A.15.2.1',)),
+('SR-7', ('A.15.2.2',)),
+('SR-8', ('None',)),
+('SR-9', ('None',)),
+('SR-10', ('None',)),
+('SR-11', ('None',)),
+('SR-12', ('None',))
+)
+
+
+# notes of the ISO 27001:2013 controls without any NIST control
+ISO13_NOTES = (
+('A.14.3.1', 'None'),
+('A.18.1.4', 'Appendix J Privacy controls'),
+('A.18.2.1', 'None')
+)
+
+
+# the command line
+#   python -m mapper input.csv output.csv --type 1 --workers 8 --format jsonl
+#   only the tables of the chosen direction are loaded, the modules needed
+#   only by some options (json, mmap, pyarrow, ...) are imported on the use
+# a column of the command line, a name or an index
+def _column(text):
+    return int(text) if text.strip().isdigit() else text
+
+
+def main(argv = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Map controls between NIST 800 53 rev 5 and ISO 27001:2013")
+    parser.add_argument("input", help="path to the input CSV, with --batch a directory or a glob pattern")
+    parser.add_argument("output", help="path to the output CSV, with --batch a directory")
+    parser.add_argument("--type", type=int, choices=[0, 1], default=1,
+                        help="0 ISO 27001:2013 -> NIST 800 53 rev 5, 1 NIST 800 53 rev 5 -> ISO 27001:2013 (default)")
+    parser.add_argument("--source", help="source framework of a registered catalogue, instead of --type")
+    parser.add_argument("--target", help="target framework of a registered catalogue, instead of --type")
+    parser.add_argument("--chain", help="frameworks of a multi-hop mapping separated by comma, e.g. INTERNAL,NIST800-53r5,ISO27001:2013")
+    parser.add_argument("--compression", choices=["gzip", "zstd", "none"],
+                        help="compression of the output, by default by its suffix (.gz, .zst)")
+    parser.add_argument("--format", choices=list(FORMATS),
+                        help="format of the output, by default by its suffix (.jsonl, .arrow, .parquet), otherwise csv")
+    parser.add_argument("--details", action="store_true", help="print the mapped list")
+    parser.add_argument("--encoding", default="utf-8", help="encoding of the input CSV (default utf-8, a byte order mark is skipped)")
+    parser.add_argument("--header", action=argparse.BooleanOptionalAction, default=None,
+                        help="the first row of the input is (not) a header, detected by default")
+    parser.add_argument("--id-column", type=_column, help="name or index of the column of the IDs (default 0, or a header column named as IDs, e.g. 'Control ID')")
+    parser.add_argument("--ref-column", type=_column,
+                        help="name or index of the column of the references (default 1, or inferred)")
+    parser.add_argument("--keep", type=lambda text: [_column(c) for c in text.split(',') if c.strip()], default=(),
+                        help="names or indexes of the columns passed through to the output, separated by comma")
+    parser.add_argument("--validate", choices=list(Validator.POLICIES),
+                        help="validate the rows: strict stops at the first error, lenient reports the errors, skip leaves the invalid rows out")
+    parser.add_argument("--no-generalise", dest="generalise", action="store_false",
+                        help="keep the enhancements such as SI-4(14) in the references (they are still mapped)")
+    parser.add_argument("--incremental", nargs="?", const=True,
+                        help="map only the rows changed since the previous run, by the sidecar index (default output.mapidx)")
+    parser.add_argument("--coverage", help="write the coverage of the target controls to this JSON file")
+    parser.add_argument("--metrics", help="write the stage times and counters to this JSON (or .prom) file, with --batch the report of all the files as JSON")
+    parser.add_argument("--stream", action="store_true", help="map row by row with a constant memory")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default 1)")
+    parser.add_argument("--batch", action="store_true",
+                        help="map all the CSVs of the input directory (or glob) into the output directory, the workers map whole files")
+    parser.add_argument("--threads", action="store_true", help="with --batch, worker threads instead of processes")
+    args = parser.parse_args(argv)
+
+    if args.chain:
+        chain = args.chain.split(',')
+        registerChain(chain)
+        args.source, args.target = chain[0], chain[-1]
+
+    if args.batch:
+        try:
+            report = mapFiles(args.input, args.output, args.type, args.workers,
+                              "thread" if args.threads else "process",
+                              source = args.source, target = args.target,
+                              compression = args.compression, format = args.format,
+                              generalise = args.generalise, validate = args.validate,
+                              encoding = args.encoding, report = args.metrics,
+                              header = args.header, idColumn = args.id_column,
+                              refColumn = args.ref_column, keep = args.keep)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        printBatch(report)
+        if report["failed_files"]:
+            sys.exit(1)
+        return
+
+    try:
+        mapper(args.input, args.output, args.type, args.details, args.stream, args.workers,
+               source = args.source, target = args.target, metrics = args.metrics,
+               compression = args.compression, format = args.format,
+               incremental = args.incremental, coverage = args.coverage,
+               generalise = args.generalise, validate = args.validate,
+               encoding = args.encoding, header = args.header, idColumn = args.id_column,
+               refColumn = args.ref_column, keep = args.keep)
+    except (OSError, ValueError, KeyError, ImportError) as e:
+        print(f"Error: {e.args[0] if isinstance(e, KeyError) else e}", file=sys.stderr)
+        sys.exit(1)
 
 
-ISO13toNIST = {
-'4.1':['PM-1','PM-11'],
-'4.2':['PM-1'],
-'4.3':['PM-1','PM-9','PM-28'],
-'4.4':['PM-1','PM-9','PM-30','PM-31'],
-'5.1':['PM-2','PM-3','PM-29'],
-'5.2':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PS-1','RA-1','SA-1','SC-1','SI-1','SR-1'],
-'5.3':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PM-2','PM-6','PM-29','PS-1','RA-1','SA-1','SC-1','SI-1','SR-1'],
-'6.1.1':['PM-1','PM-4','PM-6','PM-9'],
-'6.1.2':['PM-9','PM-28','RA-3'],
-'6.1.3':['RA-7'],
-'6.2':['PM-1','PM-3','PM-4','PM-6','PM-9','PM-14','PM-28','PM-30','PM-31'],
-'7.1':['PM-3'],
-'7.2':['PM-13'],
-'7.3':['AT-2','PS-8'],
-'7.4':['PM-1','PM-15','PM-28','PM-31'],
-'7.5.1':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','CP-2','IA-1','IR-1','IR-8','MA-1','MP-1','PE-1','PL-1','PL-2','PM-1','PM-4','PM-9','PM-28','PM-30','PM-31','PS-1','RA-1','SA-1','SA-5','SC-1','SI-1','SR-1'],
-'7.5.2':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','CP-2','IA-1','IR-1','IR-8','MA-1','MP-1','PE-1','PL-1','PL-2','PM-1','PM-4','PM-9','PM-28','PM-30','PM-31','PS-1','RA-1','SA-1','SA-5','SC-1','SI-1','SR-1'],
-'7.5.3':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','CP-2','IA-1','IR-1','IR-8','MA-1','MP-1','PE-1','PL-1','PL-2','PM-1','PM-4','PM-9','PM-28','PM-30','PM-31','PS-1','RA-1','SA-1','SA-5','SC-1','SI-1','SR-1'],
-'8.1':['CM-3','PL-7','PM-1','SA-1','SA-4'],
-'8.2':['RA-3'],
-'8.3':['CA-5','PM-4','RA-7'],
-'9.1':['CA-7','PM-6','PM-31'],
-'9.2':['CA-5','CA-7','PM-4','PM-29'],
-'9.3':['CA-6','PM-1','PM-4','PM-9','PM-10'],
-'10.1':['CA-5','PL-2','PM-4','PM-31','RA-7'],
-'10.2':['PM-1','PM-9','PM-30','PM-31'],
-'A.5.1.1':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PS-1','RA-1','SA-1','SC-1','SI-1','SR-1'],
-'A.5.1.2':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PS-1','RA-1','SA-1','SC-1','SI-1','SR-1'],
-'A.6.1.1':['AC-1','AT-1','AU-1','CA-1','CM-1','CM-9','CP-1','CP-2','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PM-2','PM-10','PM-29','PS-1','PS-7','PS-9','RA-1','SA-1','SA-3','SA-9','SC-1','SI-1','SR-1'],
-'A.6.1.2':['AC-5'],
-'A.6.1.3':['IR-6'],
-'A.6.1.4':['PM-15','SI-5'],
-'A.6.1.5':['SA-3','SA-9','SA-15'],
-'A.6.2.1':['AC-17','AC-18','AC-19'],
-'A.6.2.2':['AC-3','AC-17','PE-17'],
-'A.7.1.1':['PS-3','SA-21'],
-'A.7.1.2':['PL-4','PS-6'],
-'A.7.2.1':['PL-4','PS-6','PS-7','SA-9'],
-'A.7.2.2':['AT-2','AT-3','CP-3','IR-2','PM-13'],
-'A.7.2.3':['PS-8'],
-'A.7.3.1':['PS-4','PS-5'],
-'A.8.1.1':['CM-8'],
-'A.8.1.2':['CM-8'],
-'A.8.1.3':['PL-4'],
-'A.8.1.4':['PS-4','PS-5'],
-'A.8.2.1':['RA-2'],
-'A.8.2.2':['MP-3','PE-22'],
-'A.8.2.3':['MP-2','MP-4','MP-5','MP-6','MP-7','PE-16','PE-18','PE-20','SC-8','SC-28'],
-'A.8.3.1':['MP-2','MP-4','MP-5','MP-6','MP-7'],
-'A.8.3.2':['MP-6'],
-'A.8.3.3':['MP-5'],
-'A.9.1.1':['AC-1'],
-'A.9.1.2':['AC-3','AC-6'],
-'A.9.2.1':['AC-2','IA-2','IA-4','IA-5','IA-8'],
-'A.9.2.2':['AC-2'],
-'A.9.2.3':['AC-2','AC-6','CM-5'],
-'A.9.2.4':['IA-5'],
-'A.9.2.5':['AC-2'],
-'A.9.2.6':['AC-2'],
-'A.9.3.1':['IA-5'],
-'A.9.4.1':['AC-3','AC-24'],
-'A.9.4.2':['AC-7','AC-8','AC-9','IA-6'],
-'A.9.4.3':['IA-5'],
-'A.9.4.4':['AC-3','AC-6'],
-'A.9.4.5':['AC-3','AC-6','CM-5'],
-'A.10.1.1':['SC-13'],
-'A.10.1.2':['SC-12','SC-17'],
-'A.11.1.1':['PE-3'],
-'A.11.1.2':['PE-2','PE-3','PE-4','PE-5'],
-'A.11.1.3':['PE-3','PE-5'],
-'A.11.1.4':['CP-6','CP-7','PE-9','PE-13','PE-14','PE-15','PE-18','PE-19','PE-23'],
-'A.11.1.5':['AC-19','SC-42'],
-'A.11.1.6':['PE-16'],
-'A.11.2.1':['PE-9','PE-13','PE-14','PE-15','PE-18','PE-19','PE-23'],
-'A.11.2.2':['CP-8','PE-9','PE-10','PE-11','PE-12','PE-14','PE-15'],
-'A.11.2.3':['PE-4','PE-9'],
-'A.11.2.4':['MA-2','MA-6'],
-'A.11.2.5':['MA-2','MP-5','PE-16'],
-'A.11.2.6':['AC-19','AC-20','MP-5','PE-17'],
-'A.11.2.7':['MP-6'],
-'A.11.2.8':['AC-11'],
-'A.11.2.9':['AC-11','MP-2','MP-4'],
-'A.12.1.1':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PS-1','RA-1','SA-1','SA-5','SC-1','SC-38','SI-1','SR-1'],
-'A.12.1.2':['CM-3','CM-5','SA-10','SC-38'],
-'A.12.1.3':['AU-4','SC-38'],
-'A.12.1.4':['CM-5','SC-38'],
-'A.12.2.1':['AT-2','SC-38','SI-3'],
-'A.12.3.1':['CP-9','SC-38'],
-'A.12.4.1':['AU-3','AU-6','AU-11','AU-12','AU-14','SC-38'],
-'A.12.4.2':['AU-9','SC-38'],
-'A.12.4.3':['AU-9','AU-12','SC-38'],
-'A.12.4.4':['AU-8','SC-38'],
-'A.12.5.1':['CM-5','CM-7','CM-11','SC-38'],
-'A.12.6.1':['RA-3','RA-5','SC-38','SI-2'],
-'A.12.6.2':['CM-11','SC-38'],
-'A.12.7.1':['SC-38'],
-'A.13.1.1':['AC-3','AC-17','AC-18','AC-20','SC-7','SC-8','SC-10'],
-'A.13.1.2':['CA-3','SA-9'],
-'A.13.1.3':['AC-4','SC-7'],
-'A.13.2.1':['AC-4','AC-17','AC-18','AC-19','AC-20','CA-3','PE-17','SC-7','SC-8','SC-15'],
-'A.13.2.2':['CA-3','SA-9'],
-'A.13.2.3':['SC-8'],
-'A.13.2.4':['PS-6'],
-'A.14.1.1':['PL-2','PL-7','PL-8','SA-3','SA-4'],
-'A.14.1.2':['AC-3','AC-4','AC-17','SC-8','SC-13'],
-'A.14.1.3':['AC-3','AC-4','SC-7','SC-8','SC-13'],
-'A.14.2.1':['SA-3','SA-15','SA-17'],
-'A.14.2.2':['CM-3','SA-10','SI-2'],
-'A.14.2.3':['CM-3','CM-4','SI-2'],
-'A.14.2.4':['CM-3','SA-10'],
-'A.14.2.5':['SA-8','SA-17'],
-'A.14.2.6':['SA-3'],
-'A.14.2.7':['SA-4','SA-10','SA-11','SR-2','SR-4'],
-'A.14.2.8':['CA-2','SA-11'],
-'A.14.2.9':['SA-4'],
-'A.14.3.1':['None'],
-'A.15.1.1':['SR-1'],
-'A.15.1.2':['SA-4','SR-3'],
-'A.15.1.3':['SR-3','SR-5'],
-'A.15.2.1':['SA-9','SR-6'],
-'A.15.2.2':['RA-9','SA-9','SR-7'],
-'A.16.1.1':['IR-8'],
-'A.16.1.2':['AU-6','IR-6'],
-'A.16.1.3':['SI-2'],
-'A.16.1.4':['AU-6','IR-4'],
-'A.16.1.5':['IR-4'],
-'A.16.1.6':['IR-4'],
-'A.16.1.7':['AU-11'],
-'A.17.1.1':['CP-2'],
-'A.17.1.2':['CP-6','CP-7','CP-8','CP-9','CP-10','CP-11','CP-13'],
-'A.17.1.3':['CP-4'],
-'A.17.2.1':['CP-2','CP-6','CP-7'],
-'A.18.1.1':['AC-1','AT-1','AU-1','CA-1','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PS-1','RA-1','SA-1','SC-1','SI-1','SR-1'],
-'A.18.1.2':['CM-10'],
-'A.18.1.3':['AC-3','AU-9','CP-9'],
-'A.18.1.4':['Appendix J Privacy controls'],
-'A.18.1.5':['IA-7','SC-13'],
-'A.18.2.1':['None'],
-'A.18.2.2':['AC-1','AT-1','AU-1','CA-1','CA-2','CA-7','CM-1','CP-1','IA-1','IR-1','MA-1','MP-1','PE-1','PL-1','PM-1','PS-1','RA-1','SA-1','SC-1','SI-1','SR-1'],
-'A.18.2.3':['CA-2','CA-7']
-}
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+#   mapping service
+#
+#   python service.py --port 8080
+#   python service.py --unix /tmp/mapper.sock
+#
+#   a long running asyncio HTTP service, the mapping tables are compiled
+#   once at the start and the requests are answered by the same process,
+#   so the callers do not pay the start of Python and the import of
+#   mapper.py on every mapping, only the standard library is needed
+#
+#   GET  /health                           -> {"status": "ok", "frameworks": [...], "failed_batches": 0, ...}
+#   GET  /map?control=SI-4(14)&type=1      -> {"control": ..., "references": [...], "mapped": [...]}
+#   POST /map   {"type": 1, "controls": ["AC-2, SI-4", ...]}
+#                                          -> {"results": [{"references": [...], "mapped": [...]}, ...]}
+#   POST /map.csv?type=1   CSV body        -> the mapped CSV as written by Map.save, streamed
+#   GET  /query?kind=reverse&pattern=A.9&type=1
+#                                          -> {"kind": ..., "pattern": ..., "controls": [...]}
+#        kind = forward, reverse, sources or targets, see mapper.MapQuery
+#
+#   source=...&target=... (or "source" and "target" in the JSON) can be used
+#   instead of the type, see mapper.frameworks(), generalise=false keeps the
+#   enhancements such as SI-4(14) in the references, see mapper.Map
+#   the columns of a CSV body are inferred from its first rows as of a file,
+#   header=true/false, idColumn=, refColumn= and keep=a,b select them, see
+#   mapper.inferSchema, the answer is the same as written by Map.save
+#
+#   curl 'http://127.0.0.1:8080/map?control=SI-4(14)'
+#   curl --data-binary @test.csv 'http://127.0.0.1:8080/map.csv?type=1'
+#   curl 'http://127.0.0.1:8080/query?kind=forward&pattern=AC'
+#   curl --unix-socket /tmp/mapper.sock http://localhost/health
+#
+import argparse
+import asyncio
+import codecs
+import csv
+import io
+import json
+from urllib.parse import parse_qsl, urlsplit
+
+import mapper as mf
+
+
+# size of the CSV blocks mapped at once, maximal size of a JSON request
+_CSV_BLOCK = 4096
+_MAX_JSON = 16 << 20
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error",
+            503: "Service Unavailable"}
+
+
+# an error answered to the client with its HTTP status
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# batching of the single control requests
+#   the requests are put to a bounded queue, a single task takes all the
+#   requests waiting in it (up to size) and maps them at once, a full queue
+#   blocks the callers, which is the backpressure for too many requests
+#   an error of a batch is raised to its requests only, the task goes on
+class Batcher:
+    def __init__(self, size = 256, queue = 4096):
+        self._size = size
+        self._queue = asyncio.Queue(queue)
+        self._task = None
+        self.batches = 0
+        self.requests = 0
+        self.failed = 0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    # True while the task takes the requests
+    def running(self):
+        return self._task is not None and not self._task.done()
+
+    # mapping of a raw reference cell by a Map, returns the references and
+    # the mapped controls as lists
+    async def map(self, map, cell):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((map, cell, future))
+        return await future
+
+    async def _run(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self._size and not queue.empty():
+                batch.append(queue.get_nowait())
+            self.batches += 1
+            self.requests += len(batch)
+            rows = [["", cell] for _, cell, _ in batch]
+            # the requests of different directions are mapped each by its Map
+            for map in {id(m): m for m, _, _ in batch}.values():
+                selected = [(row, future) for row, (m, _, future) in zip(rows, batch) if m is map]
+                try:
+                    for _ in map.mapRows([row for row, _ in selected]):
+                        pass
+                except Exception as e:
+                    self.failed += 1
+                    for _, future in selected:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for row, future in selected:
+                    if not future.done():
+                        future.set_result((row[1], row[2]))
+
+
+# body of a request, read by pieces either of Content-Length or chunked
+class Body:
+    def __init__(self, reader, length = None, chunked = False):
+        self._reader = reader
+        self._left = length or 0
+        self._chunked = chunked
+        self._done = not chunked and not length
+
+    # next piece of the body, b"" at its end
+    async def read(self, size = 1 << 16):
+        if self._done:
+            return b""
+        if self._chunked:
+            if self._left == 0:
+                line = await self._reader.readline()
+                try:
+                    self._left = int(line.split(b";")[0], 16)
+                except ValueError:
+                    raise HTTPError(400, "Broken chunked body")
+                if self._left == 0:
+                    # trailers up to an empty line
+                    while (await self._reader.readline()).strip():
+                        pass
+                    self._done = True
+                    return b""
+            data = await self._reader.readexactly(min(size, self._left))
+            self._left -= len(data)
+            if self._left == 0:
+                await self._reader.readexactly(2)
+            return data
+
+        data = await self._reader.read(min(size, self._left))
+        if not data:
+            raise HTTPError(400, "Incomplete body")
+        self._left -= len(data)
+        self._done = self._left == 0
+        return data
+
+    # whole body, at most limit bytes
+    async def readAll(self, limit = _MAX_JSON):
+        parts = []
+        size = 0
+        while True:
+            data = await self.read()
+            if not data:
+                return b"".join(parts)
+            size += len(data)
+            if size > limit:
+                raise HTTPError(413, "The request is too large")
+            parts.append(data)
+
+    # reading of the rest of the body, e.g. after an error
+    async def discard(self):
+        while await self.read():
+            pass
+
+
+# the service
+#   the Maps of the built-in directions are created (and their tables
+#   compiled) at the start, the ones of other catalogues on the first use,
+#   all the requests share them and their cell caches
+#   streams = maximal number of CSV streams mapped at once, further ones
+#             wait, the written blocks wait for the client to read them
+class MappingService:
+    def __init__(self, batch = 256, queue = 4096, streams = 4, cacheSize = 65536):
+        self._cacheSize = cacheSize
+        self._maps = {}
+        for type in (0, 1):
+            self.getMap({"type": type})
+        self._batcher = Batcher(batch, queue)
+        self._streams = asyncio.Semaphore(streams)
+        self._server = None
+
+    # the Map of a direction given by the type or the source and target,
+    # and of the generalisation
+    def getMap(self, params):
+        if params.get("source") is not None or params.get("target") is not None:
+            if params.get("source") is None or params.get("target") is None:
+                raise HTTPError(400, "Both the source and the target framework must be given")
+            type = (params["source"], params["target"])
+        else:
+            try:
+                type = int(params.get("type", 1))
+            except (TypeError, ValueError):
+                raise HTTPError(400, "The type must be 0 or 1")
+            if type not in (0, 1):
+                raise HTTPError(400, "The type must be 0 or 1")
+
+        generalise = str(params.get("generalise", True)).lower() not in ("0", "false", "no")
+        key = (mf.mapDirection(type), generalise)
+        map = self._maps.get(key)
+        if map is None:
+            try:
+                map = mf.Map(None, None, type, stream = True, cacheSize = self._cacheSize,
+                             generalise = generalise)
+            except KeyError as e:
+                raise HTTPError(404, str(e.args[0]) if e.args else "Unknown frameworks")
+            self._maps[key] = map
+        return map
+
+    async def start(self, host = "127.0.0.1", port = 8080, unix = None):
+        self._batcher.start()
+        if unix is not None:
+            self._server = await asyncio.start_unix_server(self.handle, unix)
+        else:
+            self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self._batcher.stop()
+
+    # a connection, the requests are answered one by one while it is kept alive
+    async def handle(self, reader, writer):
+        try:
+            while await self._request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # a single request, returns True if the connection is kept alive
+    async def _request(self, reader, writer):
+        line = await reader.readline()
+        if not line:
+            return False
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            await self._send(writer, 400, {"error": "Broken request line"}, False)
+            return False
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keepAlive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        chunked = "chunked" in headers.get("transfer-encoding", "").lower()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            length = 0
+        body = Body(reader, length, chunked)
+
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        try:
+            if url.path == "/health" and method == "GET":
+                await self._send(writer, 200, self.health(), keepAlive)
+            elif url.path == "/map" and method == "GET":
+                if "control" not in params:
+                    raise HTTPError(400, "The control parameter is missing")
+                refs, mapped = await self._batcher.map(self.getMap(params), params["control"])
+                await self._send(writer, 200, {"control": params["control"], "references": refs,
+                                               "mapped": mapped}, keepAlive)
+            elif url.path == "/map" and method == "POST":
+                await self._send(writer, 200, await self.mapJson(params, body), keepAlive)
+            elif url.path == "/map.csv" and method == "POST":
+                if not chunked and "content-length" not in headers:
+                    raise HTTPError(411, "The CSV body needs Content-Length or chunked encoding")
+                await self.mapCsv(self.getMap(params), body, writer, params)
+            elif url.path == "/query" and method == "GET":
+                await self._send(writer, 200, self.query(params), keepAlive)
+            elif url.path in ("/health", "/map", "/map.csv", "/query"):
+                raise HTTPError(405, "Method " + method + " is not allowed")
+            else:
+                raise HTTPError(404, "Unknown path " + url.path)
+        except HTTPError as e:
+            await body.discard()
+            await self._send(writer, e.status, {"error": str(e)}, keepAlive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception as e:
+            await self._send(writer, 500, {"error": str(e)}, False)
+            return False
+        return keepAlive
+
+    def health(self):
+        return {"status": "ok" if self._batcher.running() else "error",
+                "version": mf.__version__,
+                "frameworks": [list(pair) for pair in mf.frameworks()],
+                "batches": self._batcher.batches,
+                "requests": self._batcher.requests,
+                "failed_batches": self._batcher.failed}
+
+    # a family/prefix or wildcard query of the controls, answered from the
+    # index of the mapping, see mapper.MapQuery
+    def query(self, params):
+        if "pattern" not in params:
+            raise HTTPError(400, "The pattern parameter is missing")
+        kind = params.get("kind", "forward")
+        if kind not in ("forward", "reverse", "sources", "targets"):
+            raise HTTPError(400, "The kind must be forward, reverse, sources or targets")
+        query = mf.getQuery(self.getMap(params)._mapType)
+        return {"kind": kind, "pattern": params["pattern"],
+                "controls": list(query.query(kind, params["pattern"]))}
+
+    # a batch of reference cells in JSON, mapped by the batcher together
+    # with the other waiting requests
+    async def mapJson(self, params, body):
+        try:
+            request = json.loads(await body.readAll())
+        except ValueError:
+            raise HTTPError(400, "The body is not a valid JSON")
+        if not isinstance(request, dict) or not isinstance(request.get("controls"), list):
+            raise HTTPError(400, 'The body must be an object with a list of "controls"')
+        map = self.getMap({**params, **request})
+        results = await asyncio.gather(*(self._batcher.map(map, str(cell)) for cell in request["controls"]))
+        return {"results": [{"references": refs, "mapped": mapped} for refs, mapped in results]}
+
+    # a CSV body mapped block by block as it comes and sent back in chunks
+    #   a block ends on a row boundary (an even number of quotes, as in
+    #   mapper.splitCsv), every sent chunk is drained before the next block
+    #   is read, so a slow client slows down the reading of its body
+    #   the columns are inferred from the first block before the answer
+    #   starts, so unknown columns are answered by 400, an error after the
+    #   start of the answer closes the connection, the client gets an
+    #   incomplete chunked body
+    async def mapCsv(self, map, body, writer, params = None):
+        options = self.columns(params or {})
+        async with self._streams:
+            chunks = self._mapChunks(map, body, options)
+            try:
+                first = await chunks.__anext__()
+            except StopAsyncIteration:
+                first = b""
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/csv; charset=utf-8\r\n"
+                         b"Transfer-Encoding: chunked\r\n\r\n")
+            try:
+                await self._sendChunk(writer, first)
+                async for chunk in chunks:
+                    await self._sendChunk(writer, chunk)
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+            except Exception as e:
+                raise ConnectionAbortedError("Mapping of the CSV failed: " + str(e))
+
+    # the columns of a CSV body given by the parameters, see mapper.inferSchema
+    def columns(self, params):
+        def column(text):
+            return None if text is None else int(text) if text.strip().isdigit() else text
+        header = params.get("header")
+        if header is not None:
+            header = header.lower() not in ("0", "false", "no")
+        keep = [column(c) for c in params.get("keep", "").split(',') if c.strip()]
+        return {"header": header, "idColumn": column(params.get("idColumn")),
+                "refColumn": column(params.get("refColumn")), "keep": keep}
+
+    # the mapped blocks of a CSV body as the chunks of the answer
+    async def _mapChunks(self, map, body, options):
+        rest = b""
+        lines = []
+        quotes = 0
+        schema = None
+        while True:
+            data = await body.read()
+            if not data:
+                break
+            pieces = (rest + data).split(b"\n")
+            rest = pieces.pop()
+            for piece in pieces:
+                lines.append(piece + b"\n")
+                quotes += piece.count(b'"')
+                if len(lines) >= _CSV_BLOCK and quotes % 2 == 0:
+                    if schema is None:
+                        schema, chunk = self._mapFirstBlock(map, lines, options)
+                    else:
+                        chunk = self._mapBlock(map, lines, schema)
+                    yield chunk
+                    lines = []
+                    quotes = 0
+        if rest:
+            lines.append(rest)
+        if lines:
+            if schema is None:
+                schema, chunk = self._mapFirstBlock(map, lines, options)
+            else:
+                chunk = self._mapBlock(map, lines, schema)
+            yield chunk
+
+    def _readBlock(self, lines):
+        return csv.reader(io.TextIOWrapper(io.BytesIO(b"".join(lines)), encoding="utf-8", errors="replace"))
+
+    # mapping of the first block, a byte order mark is removed and the
+    # columns are inferred from its first rows as by Map from a file, a
+    # header is written as the header of the answer
+    def _mapFirstBlock(self, map, lines, options):
+        if lines[0].startswith(codecs.BOM_UTF8):
+            lines[0] = lines[0][len(codecs.BOM_UTF8):]
+        rows = list(self._readBlock(lines))
+        try:
+            schema = mf.inferRows(rows[:mf._SCHEMA_SAMPLE], map._mapType, name = "the CSV body", **options)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        out = io.StringIO()
+        if schema.header is not None:
+            csv.writer(out).writerow(map.header(schema))
+            rows = rows[1:]
+        map.writeRows(out, map.mapRows(schema.project(rows)), schema)
+        return schema, out.getvalue().encode("utf-8")
+
+    # mapping of a block of CSV lines to CSV text
+    def _mapBlock(self, map, lines, schema):
+        out = io.StringIO()
+        map.writeRows(out, map.mapRows(schema.project(self._readBlock(lines))), schema)
+        return out.getvalue().encode("utf-8")
+
+    async def _sendChunk(self, writer, data):
+        if data:
+            writer.write(b"%x\r\n" % len(data) + data + b"\r\n")
+            await writer.drain()
+
+    async def _send(self, writer, status, content, keepAlive):
+        data = json.dumps(content).encode("utf-8")
+        writer.write(("HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n"
+                      "Connection: %s\r\n\r\n" % (status, _REASONS.get(status, ""), len(data),
+                                                  "keep-alive" if keepAlive else "close")).encode("latin-1") + data)
+        await writer.drain()
+
+
+# running of the service until it is interrupted
+async def serve(host = "127.0.0.1", port = 8080, unix = None, **options):
+    service = MappingService(**options)
+    server = await service.start(host, port, unix)
+    where = unix if unix is not None else "http://%s:%d" % (host, port)
+    print("Mapping service on " + where)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mapping service of NIST 800 53 rev 5 and ISO 27001:2013 controls")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (default 8080)")
+    parser.add_argument("--unix", help="path of a Unix socket to listen on instead of the port")
+    parser.add_argument("--batch", type=int, default=256, help="maximal number of controls mapped at once (default 256)")
+    parser.add_argument("--queue", type=int, default=4096, help="maximal number of waiting controls (default 4096)")
+    parser.add_argument("--streams", type=int, default=4, help="maximal number of CSV streams mapped at once (default 4)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, batch = args.batch,
+                          queue = args.queue, streams = args.streams))
+    except KeyboardInterrupt:
+        pass